@@ -0,0 +1,4 @@
+"""Shared helpers for the agents in this repository.
+
+Run the modules from the repository root, e.g. ``python -m agent_kit.router``.
+"""
@@ -0,0 +1,3 @@
+from agent_kit.cli import main
+
+main()
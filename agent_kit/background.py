@@ -0,0 +1,212 @@
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import threading
+from typing import Any, Awaitable, Iterable
+
+from agents import Agent, RunResult, Runner
+
+
+class BackgroundLoop:
+    """One event loop on a daemon thread, shared by every synchronous caller.
+
+    Model clients and their HTTP connection pools are bound to the loop they were
+    first used on; keeping a single loop alive for the process lets sync code
+    reuse them across calls instead of starting cold each time. ``submit`` is
+    safe from any thread, including one that is already running an event loop.
+    """
+
+    def __init__(self, name: str = "agent_kit-loop"):
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._serve, args=(ready,), name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                atexit.register(self.close)
+            return self._loop
+
+    def _serve(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def submit(self, awaitable: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop; returns a thread-safe future for its result.
+
+        The coroutine runs in a copy of the caller's context, so context variables
+        such as the rate-limit lane carry over.
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("submit() from the background loop itself would deadlock; await the coroutine instead.")
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        context = contextvars.copy_context()
+
+        def start() -> None:
+            # The future stays pending until the task ends, so the caller can still cancel it.
+            if future.cancelled():
+                awaitable.close()
+                return
+            task = loop.create_task(awaitable, context=context)
+            task.add_done_callback(lambda task: _transfer(task, future))
+            future.add_done_callback(lambda f: f.cancelled() and loop.call_soon_threadsafe(task.cancel))
+
+        loop.call_soon_threadsafe(start)
+        return future
+
+    def call(self, awaitable: Awaitable[Any], timeout: float | None = None) -> Any:
+        """Run a coroutine on the loop and block until it finishes."""
+        return self.submit(awaitable).result(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def shutdown() -> None:
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+            loop.stop()
+
+        loop.call_soon_threadsafe(lambda: loop.create_task(shutdown()))
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+def _transfer(task: asyncio.Task, future: concurrent.futures.Future) -> None:
+    if task.cancelled():
+        future.cancel()
+        return
+    if not future.set_running_or_notify_cancel():
+        # The caller cancelled and will not read the outcome, but the failure must still
+        # count as retrieved or asyncio logs "Task exception was never retrieved".
+        task.exception()
+        return
+    if task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+_default = BackgroundLoop()
+
+
+def get_loop() -> BackgroundLoop:
+    return _default
+
+
+def run_sync(starting_agent: Agent[Any], input: Any, **kwargs: Any) -> RunResult:
+    """Drop-in for ``Runner.run_sync`` that runs on the shared background loop."""
+    return _default.call(Runner.run(starting_agent, input, **kwargs))
+
+
+def run_batch(
+    starting_agent: Agent[Any],
+    inputs: Iterable[Any],
+    return_exceptions: bool = False,
+    **kwargs: Any,
+) -> list[Any]:
+    """Run the agent on several inputs concurrently and return the results in order.
+
+    Keyword arguments (``context``, ``run_config``...) are shared by every run. With
+    ``return_exceptions=True`` a failed run's exception takes its place in the list.
+    """
+
+    async def batch() -> list[Any]:
+        runs = [Runner.run(starting_agent, input, **kwargs) for input in inputs]
+        return await asyncio.gather(*runs, return_exceptions=return_exceptions)
+
+    return _default.call(batch())
+
+
+def main():
+    # Ten sync calls through a real HTTP client against a local OpenAI-compatible server.
+    import socket
+    import time
+
+    import uvicorn
+    from agents import AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    client_ports: set[int] = set()
+
+    async def completions(request: Request) -> JSONResponse:
+        client_ports.add(request.client.port)
+        await asyncio.sleep(0.05)
+        return JSONResponse(
+            {
+                "id": "local",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "local",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Hello!"}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+            }
+        )
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(Starlette(routes=[Route("/v1/chat/completions", completions, methods=["POST"])]), port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+
+    def make_config(client: AsyncOpenAI) -> RunConfig:
+        return RunConfig(model=OpenAIChatCompletionsModel(model="local", openai_client=client), tracing_disabled=True)
+
+    async def fresh_client_run(query: str) -> None:
+        client = AsyncOpenAI(api_key="local", base_url=f"http://127.0.0.1:{port}/v1")
+        try:
+            await Runner.run(agent, query, run_config=make_config(client))
+        finally:
+            await client.close()
+
+    agent = Agent(name="Assistant", instructions="You are a helpful assistant.")
+    queries = [f"Question {i}" for i in range(10)]
+
+    def report(label: str, start: float) -> None:
+        print(f"{label:<26} {time.perf_counter() - start:.2f}s, {len(client_ports)} connections")
+        client_ports.clear()
+
+    # What sync code has to do without a shared loop: a new loop, so a new client, per call.
+    start = time.perf_counter()
+    for query in queries:
+        asyncio.run(fresh_client_run(query))
+    report("asyncio.run per call", start)
+
+    config = make_config(AsyncOpenAI(api_key="local", base_url=f"http://127.0.0.1:{port}/v1"))
+    start = time.perf_counter()
+    for query in queries:
+        run_sync(agent, query, run_config=config)
+    report("shared loop, run_sync", start)
+
+    start = time.perf_counter()
+    run_batch(agent, queries, run_config=config)
+    report("shared loop, run_batch", start)
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator
+
+from agents import Model, ModelResponse
+from agents.usage import Usage
+from openai.types.responses import ResponseOutputItem, ResponseStreamEvent
+from pydantic import TypeAdapter
+
+MODES = ("record", "replay", "auto")
+
+_items = TypeAdapter(list[ResponseOutputItem])
+_event = TypeAdapter(ResponseStreamEvent)
+_usage = TypeAdapter(Usage)
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request the cassette has no recording of."""
+
+
+def request_key(system_instructions, input, model_settings, tools, output_schema, handoffs) -> str:
+    """A stable hash of everything that determines what the model is asked."""
+    request = {
+        "system": system_instructions,
+        "input": input,
+        "settings": model_settings.to_json_dict() if model_settings is not None else None,
+        "tools": [[tool.name, getattr(tool, "params_json_schema", None)] for tool in tools],
+        "output": None if output_schema is None or output_schema.is_plain_text() else output_schema.json_schema(),
+        "handoffs": [[handoff.tool_name, handoff.input_json_schema] for handoff in handoffs],
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+class CassetteModel(Model):
+    """Records a model's traffic to a cassette file, or replays it without the model.
+
+    ``record`` forwards every call and stores the response (or each stream event)
+    with its timing; ``replay`` answers from the cassette, sleeping the recorded
+    delays divided by ``speed`` (``float("inf")`` replays instantly); ``auto``
+    replays what is recorded and records the rest. Identical requests are replayed
+    in the order they were recorded, so concurrent tool calls match up no matter
+    which finishes first. Cassettes are gzipped JSON lines, one call per line, and
+    are written on ``save()`` and at exit.
+    """
+
+    def __init__(self, model: Model | None, path: str, mode: str = "replay", speed: float = 1.0):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {list(MODES)}")
+        if mode != "replay" and model is None:
+            raise ValueError(f"Cassette mode {mode!r} needs a model to record from.")
+        self.model = model
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.loaded: list[dict[str, Any]] = []
+        self.recorded: list[dict[str, Any]] = []
+        self._tapes: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self.replayed = 0
+        if mode != "record" and os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    entry = json.loads(line)
+                    self.loaded.append(entry)
+                    self._tapes[entry["key"]].append(entry)
+        if mode != "replay":
+            atexit.register(self.save)
+
+    def save(self) -> None:
+        if not self.recorded:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # In auto mode the file also keeps everything that was loaded from it.
+        with gzip.open(self.path, "wt", encoding="utf-8") as file:
+            for entry in (self.loaded if self.mode == "auto" else []) + self.recorded:
+                file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _take(self, key: str, kind: str) -> dict[str, Any] | None:
+        tape = self._tapes.get(key)
+        if tape:
+            for entry in tape:
+                if entry["kind"] == kind:
+                    tape.remove(entry)
+                    self.replayed += 1
+                    return entry
+        if self.mode == "replay":
+            raise CassetteMiss(f"No recorded {kind} for request {key} in {self.path}")
+        return None
+
+    async def _wait(self, seconds: float) -> None:
+        await asyncio.sleep(seconds / self.speed)
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        prompt=None,
+        **kwargs,
+    ) -> ModelResponse:
+        key = request_key(system_instructions, input, model_settings, tools, output_schema, handoffs)
+        if self.mode != "record":
+            entry = self._take(key, "response")
+            if entry is not None:
+                await self._wait(entry["latency"])
+                return ModelResponse(
+                    output=_items.validate_python(entry["output"]),
+                    usage=_usage.validate_python(entry["usage"]),
+                    response_id=entry["response_id"],
+                )
+
+        start = time.perf_counter()
+        response = await self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            prompt=prompt,
+            **kwargs,
+        )
+        self.recorded.append(
+            {
+                "key": key,
+                "kind": "response",
+                "latency": round(time.perf_counter() - start, 4),
+                "output": _items.dump_python(response.output, mode="json", exclude_none=True),
+                "usage": _usage.dump_python(response.usage, mode="json"),
+                "response_id": response.response_id,
+            }
+        )
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        prompt=None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        key = request_key(system_instructions, input, model_settings, tools, output_schema, handoffs)
+        if self.mode != "record":
+            entry = self._take(key, "stream")
+            if entry is not None:
+                for delay, event in entry["events"]:
+                    await self._wait(delay)
+                    yield _event.validate_python(event)
+                return
+
+        events: list[list[Any]] = []
+        last = time.perf_counter()
+        stream = self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            prompt=prompt,
+            **kwargs,
+        )
+        try:
+            async for event in stream:
+                now = time.perf_counter()
+                events.append([round(now - last, 4), event.model_dump(mode="json", exclude_none=True)])
+                last = now
+                yield event
+        finally:
+            # The runner may stop iterating at response.completed; keep complete streams only.
+            if events and events[-1][1].get("type") == "response.completed":
+                self.recorded.append({"key": key, "kind": "stream", "events": events})
+
+
+def cassette_from_env(model: Model) -> Model:
+    """Wrap ``model`` in a cassette when ``AGENT_KIT_CASSETTE`` names a file.
+
+    ``AGENT_KIT_CASSETTE_MODE`` picks the mode (default ``replay``) and
+    ``AGENT_KIT_REPLAY_SPEED`` the replay speed (default 1).
+    """
+    path = os.getenv("AGENT_KIT_CASSETTE")
+    if not path:
+        return model
+    mode = os.getenv("AGENT_KIT_CASSETTE_MODE", "replay")
+    return CassetteModel(model, path, mode=mode, speed=float(os.getenv("AGENT_KIT_REPLAY_SPEED", "1")))
+
+
+async def main():
+    # Record the country orchestrator (three agent-as-tool calls) once, then replay it.
+    import tempfile
+
+    from agents import RunConfig, Runner, set_tracing_disabled
+
+    from agent_kit.stand_in import StandInCall, StandInModel, ToolCall, has_tool_output, last_user_text
+    from country_info_bot import country_info_toolkit as toolkit
+
+    def reply(call: StandInCall):
+        if call.tools and not has_tool_output(call.input):
+            country = last_user_text(call.input).removeprefix("Tell me about ")
+            return [ToolCall(tool.name, {"input": country}) for tool in call.tools]
+        return f"Stand-in answer to: {last_user_text(call.input)}"
+
+    path = os.path.join(tempfile.mkdtemp(), "country_info.jsonl.gz")
+    stand_in = StandInModel(latency=0.2, jitter=0.1, seed=0, reply=reply)
+    countries = ["France", "Brazil", "Germany", "Japan"]
+
+    # Agent-as-tool runs get no run config, so the sub-agents' own model is swapped too.
+    set_tracing_disabled(True)
+    agents = [toolkit.orchestrator, toolkit.capital_agent, toolkit.language_agent, toolkit.population_agent]
+
+    async def run_all(model: Model) -> tuple[float, list[str]]:
+        for agent in agents:
+            agent.model = model
+        config = RunConfig(model=model, tracing_disabled=True)
+        start = time.perf_counter()
+        results = [await Runner.run(toolkit.orchestrator, f"Tell me about {country}", run_config=config) for country in countries]
+        return time.perf_counter() - start, [result.final_output for result in results]
+
+    recorder = CassetteModel(stand_in, path, mode="record")
+    elapsed, recorded = await run_all(recorder)
+    recorder.save()
+    print(f"recorded  {elapsed:.2f}s, {stand_in.calls} model calls, cassette {os.path.getsize(path)} bytes")
+    for speed in (1.0, 10.0, float("inf")):
+        elapsed, replayed = await run_all(CassetteModel(None, path, speed=speed))
+        print(f"replay x{speed:<4g} {elapsed:.2f}s, outputs identical: {replayed == recorded}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,189 @@
+"""One entry point for every agent in the repository.
+
+    python -m agent_kit list
+    python -m agent_kit bank
+    python -m agent_kit profile library --top 15
+    python -m agent_kit serve bank --port 8000
+    python -m agent_kit load mini-bank --users 1,10,100
+
+Only the selected agent module is imported, so a subcommand pays for the SDK
+import once and never for the other agents.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subcommand -> (module, description).
+AGENTS = {
+    "bank": ("bank_agent.main", "Bank agent with a balance tool and an input guardrail"),
+    "code-explainer": ("code_explainer_agent.main", "Explain Python code line by line"),
+    "context": ("context.context", "Friendly assistant with a context-aware tool"),
+    "country-info": ("country_info_bot.country_info_toolkit", "Country orchestrator using agents as tools"),
+    "library": ("library_assistant.main", "Library assistant with dynamic instructions"),
+    "mini-bank": ("mini_bank_agent.main", "Bank agent with handoffs and input/output guardrails"),
+    "mood": ("mood_analyzer_with_handoffs.mood_handoff", "Mood analyzer handing off to an activity suggester"),
+    "practice": ("practice.main", "Score feedback agent with a math homework guardrail"),
+    "smart-store": ("smart_store_agent.product_suggester", "Pharmacy product recommendations"),
+    "support": ("support_agent_system.main", "Streaming support triage with billing/technical handoffs"),
+    "lite-llm": ("uv_openrouter_and_litellm.lite_llm.main", "Assistant on Gemini via LiteLLM"),
+    "open-router": ("uv_openrouter_and_litellm.open_router.main", "Assistant on DeepSeek via OpenRouter"),
+}
+
+
+def load_agent_module(name: str):
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return importlib.import_module(AGENTS[name][0])
+
+
+def run_agent(name: str) -> None:
+    module = load_agent_module(name)
+    result = module.main()
+    if hasattr(result, "__await__"):
+        import asyncio
+
+        asyncio.run(result)
+
+
+def profile_imports(name: str) -> dict:
+    """Import the agent module in a fresh interpreter under ``-X importtime``."""
+    module = AGENTS[name][0]
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    entries = []
+    errors = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        fields = line[len("import time:"):].split("|")
+        if fields[0].strip() == "self [us]":
+            continue
+        entries.append(
+            {
+                "module": fields[2][1:].rstrip(),
+                "self_ms": int(fields[0]) / 1000,
+                "cumulative_ms": int(fields[1]) / 1000,
+            }
+        )
+    if completed.returncode != 0:
+        raise SystemExit("\n".join(errors) or f"Importing {module} failed.")
+    top_level = [entry for entry in entries if not entry["module"].startswith(" ")]
+    return {
+        "agent": name,
+        "module": module,
+        "wall_ms": round(wall * 1000, 1),
+        "import_ms": round(sum(entry["cumulative_ms"] for entry in top_level), 1),
+        "entries": entries,
+    }
+
+
+def print_profile(report: dict, top: int) -> None:
+    print(f"{report['agent']} ({report['module']})")
+    print(f"  interpreter + imports: {report['wall_ms']:.1f} ms, imports: {report['import_ms']:.1f} ms")
+    print("  slowest imports (cumulative):")
+    slowest = sorted(report["entries"], key=lambda entry: entry["cumulative_ms"], reverse=True)[:top]
+    for entry in slowest:
+        print(f"    {entry['cumulative_ms']:9.1f} ms  {entry['module'].strip()}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m agent_kit", description="Run the agents in this repository.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List the available agents")
+    for name, (_, description) in AGENTS.items():
+        commands.add_parser(name, help=description)
+    profile = commands.add_parser("profile", help="Report import time of agent modules (-X importtime)")
+    profile.add_argument("agents", nargs="*", metavar="agent", help="Agents to profile (default: all)")
+    profile.add_argument("--top", type=int, default=10, help="How many of the slowest imports to show")
+    profile.add_argument("--json", action="store_true", help="Print one JSON summary per agent for tracking")
+    serve = commands.add_parser("serve", help="Serve a bank agent over HTTP (run + SSE stream)")
+    serve.add_argument("agent", choices=["bank", "mini-bank"])
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--max-concurrency", type=int, default=64, help="Runs allowed in flight at once")
+    serve.add_argument("--max-queue", type=int, default=256, help="Requests allowed to wait before 503s")
+    serve_bench = commands.add_parser("serve-bench", help="Load test the HTTP server against a stand-in model")
+    serve_bench.add_argument("agent", choices=["bank", "mini-bank"])
+    serve_bench.add_argument("--requests", type=int, default=1000)
+    serve_bench.add_argument("--concurrency", type=int, default=50)
+    serve_bench.add_argument("--latency", type=float, default=0.05, help="Stand-in model latency in seconds")
+    serve_bench.add_argument("--stream", action="store_true", help="Use the SSE endpoint")
+    load = commands.add_parser("load", help="Generate in-process load against an agent and watch event-loop lag")
+    load.add_argument("agent", help="Agent to load (bank, mini-bank, code-explainer, country-info, library, support)")
+    levels = load.add_mutually_exclusive_group()
+    levels.add_argument("--users", help="Closed loop: comma-separated numbers of concurrent users (default 1,4,16,64,256)")
+    levels.add_argument("--rate", help="Open loop: comma-separated arrival rates in requests/sec")
+    load.add_argument("--duration", type=float, default=10.0, help="Seconds per load level")
+    load.add_argument("--latency", type=float, default=0.5, help="Stand-in model latency in seconds")
+    load.add_argument("--live", action="store_true", help="Use the agent's real model instead of the stand-in")
+    load.add_argument("--window", type=float, help="Also print a timeline per window of this many seconds")
+    load.add_argument("--detect-blocking", type=float, metavar="MS", help="Report callbacks blocking the loop longer than MS")
+    load.add_argument("--json", action="store_true", help="Print one JSON summary per level")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for name, (module, description) in AGENTS.items():
+            print(f"{name:<15} {description}  [{module}]")
+    elif args.command == "profile":
+        unknown = [name for name in args.agents if name not in AGENTS]
+        if unknown:
+            parser.error(f"unknown agent(s): {', '.join(unknown)}")
+        for name in args.agents or AGENTS:
+            report = profile_imports(name)
+            if args.json:
+                print(json.dumps({key: report[key] for key in ("agent", "module", "wall_ms", "import_ms")}))
+            else:
+                print_profile(report, args.top)
+    elif args.command == "serve":
+        from agent_kit.serve import serve
+
+        serve(args.agent, args.host, args.port, max_concurrency=args.max_concurrency, max_queue=args.max_queue)
+    elif args.command == "serve-bench":
+        import asyncio
+
+        from agent_kit.serve import bench
+
+        report = asyncio.run(bench(args.agent, args.requests, args.concurrency, args.latency, args.stream))
+        print(json.dumps(report))
+    elif args.command == "load":
+        import asyncio
+
+        from agent_kit.load import WORKLOADS, sweep
+
+        if args.agent not in WORKLOADS:
+            parser.error(f"no load workload for {args.agent!r}; choose from {', '.join(WORKLOADS)}")
+        mode, levels = ("open", args.rate) if args.rate else ("closed", args.users or "1,4,16,64,256")
+        results = asyncio.run(
+            sweep(
+                args.agent,
+                mode,
+                [float(level) for level in levels.split(",")],
+                args.duration,
+                args.latency,
+                args.live,
+                args.window,
+                args.detect_blocking / 1000 if args.detect_blocking is not None else None,
+            )
+        )
+        if args.json:
+            for result in results:
+                print(json.dumps({"agent": args.agent, **result.summary(), "timeline": result.timeline(args.window or 1.0)}))
+    else:
+        run_agent(args.command)
@@ -0,0 +1,154 @@
+import asyncio
+import inspect
+import json
+from typing import Any, Callable
+
+from agents import Agent, FunctionTool, ModelBehaviorError, RunContextWrapper
+from agents.agent import ToolsToFinalOutputResult
+from agents.tool import FunctionToolResult, default_tool_error_function
+
+# How default_tool_error_function's messages start; pure_tool and function_tool use it by default.
+_DEFAULT_ERROR_PREFIX = "An error occurred while running the tool."
+
+
+def _parameters(tool: FunctionTool) -> dict[str, Any]:
+    return tool.params_json_schema.get("properties", {})
+
+
+def composite_tool(*tools: FunctionTool, name: str | None = None, description: str | None = None) -> FunctionTool:
+    """One tool that runs several lookups concurrently and returns their outputs together.
+
+    Its parameters are the union of the tools' parameters (shared names must have
+    the same schema) and each tool gets only its own arguments. Every tool goes
+    through its own ``on_invoke_tool``, so memoization and offloading still apply.
+    The composite is enabled only when all of its tools are.
+    """
+    if len(tools) < 2:
+        raise ValueError("A composite needs at least two tools.")
+    properties: dict[str, Any] = {}
+    for tool in tools:
+        for param, schema in _parameters(tool).items():
+            if properties.setdefault(param, schema) != schema:
+                raise ValueError(f"Parameter {param!r} has different schemas in the tools being combined.")
+    strict = all(tool.strict_json_schema for tool in tools)
+    tool_name = name or "_and_".join(tool.name for tool in tools)
+    params_json_schema = {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties) if strict else sorted({p for t in tools for p in t.params_json_schema.get("required", [])}),
+        "additionalProperties": False,
+        "title": f"{tool_name}_args",
+    }
+
+    async def on_invoke_tool(ctx: RunContextWrapper[Any], args_json: str) -> str:
+        try:
+            args = json.loads(args_json or "{}")
+            if not isinstance(args, dict):
+                raise ValueError("arguments must be a JSON object")
+        except ValueError:
+            # Reported to the model, as function_tool does, instead of ending the run.
+            return default_tool_error_function(ctx, ModelBehaviorError(f"Invalid JSON input for tool {tool_name}: {args_json}"))
+        calls = [
+            tool.on_invoke_tool(ctx, json.dumps({param: args[param] for param in _parameters(tool) if param in args}))
+            for tool in tools
+        ]
+        return "\n".join(str(output) for output in await asyncio.gather(*calls))
+
+    async def is_enabled(ctx: RunContextWrapper[Any], agent: Agent[Any]) -> bool:
+        for tool in tools:
+            enabled = tool.is_enabled
+            if callable(enabled):
+                enabled = enabled(ctx, agent)
+                if inspect.isawaitable(enabled):
+                    enabled = await enabled
+            if not enabled:
+                return False
+        return True
+
+    return FunctionTool(
+        name=tool_name,
+        description=description or " Also: ".join(tool.description.strip() for tool in tools),
+        params_json_schema=params_json_schema,
+        on_invoke_tool=on_invoke_tool,
+        strict_json_schema=strict,
+        is_enabled=is_enabled,
+    )
+
+
+def related_composites(*tools: FunctionTool) -> list[FunctionTool]:
+    """A composite for every group of two or more tools taking exactly the same parameters.
+
+    Tools keyed on the same arguments (e.g. two lookups by ``book_name``) are the
+    ones a model tends to call together for a single question.
+    """
+    groups: dict[str, list[FunctionTool]] = {}
+    for tool in tools:
+        parameters = _parameters(tool)
+        if parameters:
+            groups.setdefault(json.dumps(parameters, sort_keys=True), []).append(tool)
+    return [composite_tool(*group) for group in groups.values() if len(group) > 1]
+
+
+def tool_failed(output: Any) -> bool:
+    """Whether a tool output (or any line of a composite's output) is a default tool error message."""
+    return any(line.startswith(_DEFAULT_ERROR_PREFIX) for line in str(output).splitlines())
+
+
+def format_locally(
+    tool_names: set[str] | frozenset[str],
+    formatter: Callable[[RunContextWrapper[Any], list[str]], str] | None = None,
+    failed: Callable[[Any], bool] = tool_failed,
+):
+    """A ``tool_use_behavior`` that answers from tool outputs when they need no rewording.
+
+    If every tool called in a turn is in ``tool_names`` and none of them ``failed``,
+    their outputs (joined by ``formatter``, one per line by default) become the
+    final output and the model is not called again. Otherwise the model gets
+    another turn, so it can retry or explain an error to the user.
+    """
+
+    def behavior(ctx: RunContextWrapper[Any], results: list[FunctionToolResult]) -> ToolsToFinalOutputResult:
+        if not results or any(result.tool.name not in tool_names or failed(result.output) for result in results):
+            return ToolsToFinalOutputResult(is_final_output=False)
+        outputs = [str(result.output) for result in results]
+        return ToolsToFinalOutputResult(is_final_output=True, final_output=formatter(ctx, outputs) if formatter else "\n".join(outputs))
+
+    return behavior
+
+
+async def main():
+    # "Do you have X and how many copies?": two tool calls plus a second model turn, then one composite call.
+    import time
+
+    from agents import ModelSettings, RunConfig, Runner
+
+    from agent_kit.stand_in import StandInCall, StandInModel, ToolCall, has_tool_output
+    from library_assistant.main import User, check_availability, library_agent, search_book
+
+    book = "Atomic Habits"
+
+    def reply(call: StandInCall):
+        if has_tool_output(call.input):
+            return f"Yes, we have {book}, with 5 copies available."
+        names = {tool.name for tool in call.tools}
+        if "search_book_and_check_availability" in names:
+            return [ToolCall("search_book_and_check_availability", {"book_name": book})]
+        return [ToolCall("search_book", {"book_name": book}), ToolCall("check_availability", {"book_name": book})]
+
+    user = User(name="Alishba", member_id=1001)
+    before = library_agent.clone(
+        tools=[search_book, check_availability],
+        input_guardrails=[],
+        model_settings=ModelSettings(temperature=0.2, tool_choice="auto", parallel_tool_calls=None),
+        tool_use_behavior="run_llm_again",
+    )
+    after = library_agent.clone(input_guardrails=[])
+    for label, agent in [("two tools + LLM turn", before), ("composite, local", after)]:
+        stand_in = StandInModel(latency=0.3, reply=reply)
+        start = time.perf_counter()
+        result = await Runner.run(agent, f"Do you have {book} and how many copies?", context=user, run_config=RunConfig(model=stand_in, tracing_disabled=True))
+        print(f"{label:<22} {stand_in.calls} model calls, {time.perf_counter() - start:.2f}s: {result.final_output!r}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
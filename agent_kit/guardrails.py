@@ -0,0 +1,289 @@
+import asyncio
+import functools
+import hashlib
+import typing
+import json
+import logging
+import weakref
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrail,
+    OutputGuardrail,
+    InputGuardrailTripwireTriggered,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+)
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, create_model
+
+from agent_kit.json_stream import IncrementalJSONParser
+from agent_kit.rate_limit import priority_lane
+
+STAGES = ("input", "output")
+
+logger = logging.getLogger(__name__)
+
+# Streams still finishing their reasoning after the decision was made.
+_background: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class Policy:
+    """One yes/no question a guardrail asks about a piece of text."""
+    name: str
+    description: str
+    stages: tuple[str, ...] = STAGES
+
+
+def _text_key(text: Any) -> str:
+    raw = text if isinstance(text, str) else json.dumps(text, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _log_outcome(task: asyncio.Task) -> None:
+    _background.discard(task)
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.warning("guardrail stream failed after its decision: %r", task.exception())
+    else:
+        logger.debug("guardrail verdict: %r", task.result())
+
+
+@functools.lru_cache(maxsize=256)
+def _field_adapter(output_type: Any, field: str) -> TypeAdapter | None:
+    """A validator for one field of a structured output type, or None if the field is unknown."""
+    if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+        info = output_type.model_fields.get(field)
+        return TypeAdapter(info.annotation) if info is not None else None
+    try:
+        hints = typing.get_type_hints(output_type)
+    except TypeError:
+        return None
+    return TypeAdapter(hints[field]) if field in hints else None
+
+
+def stream_fields(
+    agent: Agent[Any],
+    input: Any,
+    fields: tuple[str, ...],
+    *,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+) -> tuple[dict[str, asyncio.Future], asyncio.Task]:
+    """Run a structured-output agent streamed, resolving each named field as soon as it is parsed.
+
+    Returns one future per field and the task for the whole run, whose result is
+    the validated final output. Each early value is validated against the field's
+    annotation in the agent's output type, as the final output would be. The run
+    keeps going after the fields resolve (so the verdict, reasoning included, is
+    still logged). Fields the stream never produced, or produced with a value that
+    fails validation, are taken from the final output.
+    """
+    loop = asyncio.get_running_loop()
+    futures = {field: loop.create_future() for field in fields}
+    # AgentOutputSchema (and the registry's cached schema) keep the type in .output_type.
+    output_type = getattr(agent.output_type, "output_type", agent.output_type)
+    adapters = {field: _field_adapter(output_type, field) for field in fields}
+
+    async def consume() -> Any:
+        parser = IncrementalJSONParser()
+        try:
+            result = Runner.run_streamed(agent, input, context=context, run_config=run_config)
+            async for event in result.stream_events():
+                if event.type == "raw_response_event" and event.data.type == "response.output_text.delta":
+                    for key, value in parser.feed(event.data.delta):
+                        future = futures.get(key)
+                        if future is None or future.done() or adapters[key] is None:
+                            continue
+                        try:
+                            future.set_result(adapters[key].validate_python(value))
+                        except ValidationError:
+                            pass
+            final_output = result.final_output
+            for key, future in futures.items():
+                if not future.done():
+                    future.set_result(getattr(final_output, key))
+            return final_output
+        except BaseException as error:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(error)
+                    # Mark as retrieved; the task itself reports the failure.
+                    future.exception()
+            raise
+
+    task = asyncio.ensure_future(consume())
+    _background.add(task)
+    task.add_done_callback(_log_outcome)
+    return futures, task
+
+
+async def early_decision(
+    agent: Agent[Any],
+    input: Any,
+    field: str,
+    *,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+    lane: str | None = None,
+) -> tuple[Any, asyncio.Task]:
+    """The value of one structured-output field, without waiting for the fields after it.
+
+    With ``lane`` the run's model calls are queued in that rate-limit lane.
+    """
+    # The run's task copies the current context, so its model calls queue in this lane.
+    with priority_lane(lane) if lane else nullcontext():
+        futures, task = stream_fields(agent, input, (field,), context=context, run_config=run_config)
+    return await futures[field], task
+
+
+class GuardrailEngine:
+    """Evaluates every registered policy for a text in one structured-output call.
+
+    Each policy becomes a boolean field of a single verdict model (the free-text
+    ``reasoning`` comes last), and each guardrail built from the engine reads its
+    own field. Verdicts are shared within a run: guardrails checking the same text
+    at the same stage, at the same time or later, reuse one model call.
+
+    The verdict is streamed and parsed as it arrives, so a guardrail decides as
+    soon as its boolean is out; the reasoning finishes in the background and is
+    logged at debug level on the ``agent_kit.guardrails`` logger.
+    """
+
+    def __init__(self, run_config: RunConfig, name: str = "Guardrail Agent", lane: str | None = None):
+        self.run_config = run_config
+        self.name = name
+        self.lane = lane
+        self.policies: dict[str, Policy] = {}
+        self._agents: dict[str, Agent] = {}
+        self._verdicts: dict[int, dict[tuple[str, str], tuple[dict[str, asyncio.Future], asyncio.Task]]] = {}
+        self.model_calls = 0
+        self.deduplicated = 0
+
+    def register(self, name: str, description: str, stages: tuple[str, ...] = STAGES) -> Policy:
+        policy = Policy(name, description, stages)
+        self.policies[name] = policy
+        self._agents.clear()
+        return policy
+
+    def agent_for(self, stage: str) -> Agent:
+        """The guardrail agent for a stage, built once with a field per applicable policy."""
+        if stage not in self._agents:
+            policies = [policy for policy in self.policies.values() if stage in policy.stages]
+            fields: dict[str, Any] = {
+                policy.name: (bool, Field(description=policy.description)) for policy in policies
+            }
+            fields["reasoning"] = (str, Field(description="One or two sentences explaining the verdict."))
+            verdict = create_model(f"{stage.capitalize()}GuardrailVerdict", **fields)
+            rules = "\n".join(f"- {policy.name}: {policy.description}" for policy in policies)
+            self._agents[stage] = Agent(
+                name=f"{self.name} ({stage})",
+                instructions=(
+                    f"Check the {stage} text against every policy below and set each field to true or false.\n"
+                    f"{rules}\n"
+                    "Then explain your decision in 'reasoning'."
+                ),
+                output_type=verdict,
+            )
+        return self._agents[stage]
+
+    def _evaluate(self, ctx: RunContextWrapper[Any], stage: str, text: Any) -> tuple[dict[str, asyncio.Future], asyncio.Task]:
+        self.model_calls += 1
+        agent = self.agent_for(stage)
+        fields = tuple(name for name, policy in self.policies.items() if stage in policy.stages)
+        # The run's task copies the current context, so its model calls queue in this lane.
+        with priority_lane(self.lane) if self.lane else nullcontext():
+            return stream_fields(agent, text, fields, context=ctx.context, run_config=self.run_config)
+
+    def _stream(self, ctx: RunContextWrapper[Any], stage: str, text: Any) -> tuple[dict[str, asyncio.Future], asyncio.Task]:
+        run_verdicts = self._verdicts.get(id(ctx))
+        if run_verdicts is None:
+            run_verdicts = self._verdicts[id(ctx)] = {}
+            # Drop this run's verdicts when its context wrapper goes away.
+            weakref.finalize(ctx, self._verdicts.pop, id(ctx), None)
+        key = (stage, _text_key(text))
+        stream = run_verdicts.get(key)
+        if stream is None:
+            stream = run_verdicts[key] = self._evaluate(ctx, stage, text)
+        else:
+            self.deduplicated += 1
+        return stream
+
+    async def verdict(self, ctx: RunContextWrapper[Any], stage: str, text: Any) -> BaseModel:
+        """The complete verdict, reasoning included."""
+        _, task = self._stream(ctx, stage, text)
+        return await asyncio.shield(task)
+
+    async def decide(self, ctx: RunContextWrapper[Any], stage: str, text: Any, policy: str) -> bool:
+        """One policy's answer, available as soon as its field has streamed in."""
+        futures, _ = self._stream(ctx, stage, text)
+        return await asyncio.shield(futures[policy])
+
+    def _check(self, policy: str, stage: str, trip_when: bool):
+        if policy not in self.policies:
+            raise ValueError(f"Unknown policy {policy!r}; register it first.")
+
+        async def check(ctx: RunContextWrapper[Any], agent: Agent, text: Any) -> GuardrailFunctionOutput:
+            text = text if isinstance(text, (str, list)) else str(text)
+            value = await self.decide(ctx, stage, text, policy)
+            return GuardrailFunctionOutput(output_info={policy: value}, tripwire_triggered=value == trip_when)
+
+        return check
+
+    def input_guardrail(self, policy: str, trip_when: bool = False) -> InputGuardrail:
+        """An input guardrail that trips when ``policy`` evaluates to ``trip_when``."""
+        return InputGuardrail(guardrail_function=self._check(policy, "input", trip_when), name=f"{policy} (input)")
+
+    def output_guardrail(self, policy: str, trip_when: bool = False) -> OutputGuardrail:
+        """An output guardrail that trips when ``policy`` evaluates to ``trip_when``."""
+        return OutputGuardrail(guardrail_function=self._check(policy, "output", trip_when), name=f"{policy} (output)")
+
+
+async def main():
+    # Three policies that used to need three guardrail agents, checked with one call.
+    import time
+
+    from agent_kit.stand_in import StandInCall, StandInModel, default_reply, sample_for_schema
+
+    def reply(call: StandInCall):
+        if call.output_schema is None or call.output_schema.is_plain_text():
+            return default_reply(call)
+        verdict = sample_for_schema(call.output_schema.json_schema())
+        verdict["reasoning"] = "The user asks about their account balance, which is a banking question. " * 6
+        return json.dumps(verdict)
+
+    # Roughly 50 output tokens per second, so the reasoning dominates the verdict's latency.
+    stand_in = StandInModel(latency=0.1, reply=reply, chunk_size=4, chunk_latency=0.02)
+    engine = GuardrailEngine(RunConfig(model=stand_in, tracing_disabled=True))
+    engine.register("is_bank_related", "true if the user is asking a bank related query", stages=("input",))
+    engine.register("is_library_related", "true if the query is about the library (books, availability, timings)", stages=("input",))
+    engine.register("is_math_homework", "true if the user is asking you to do their math homework", stages=("input",))
+
+    agent = Agent(
+        name="Assistant",
+        instructions="You are a Helpful Assistant.",
+        input_guardrails=[
+            engine.input_guardrail("is_bank_related"),
+            engine.input_guardrail("is_library_related"),
+            engine.input_guardrail("is_math_homework", trip_when=True),
+        ],
+    )
+    start = time.monotonic()
+    try:
+        await Runner.run(agent, "What is my account balance?", run_config=RunConfig(model=stand_in, tracing_disabled=True))
+    except InputGuardrailTripwireTriggered as tripped:
+        print(f"{type(tripped).__name__} after {time.monotonic() - start:.2f}s: {tripped.guardrail_result.output.output_info}")
+    start = time.monotonic()
+    verdict = await engine.verdict(RunContextWrapper(None), "input", "What is my account balance?")
+    print(f"complete verdict after {time.monotonic() - start:.2f}s ({len(verdict.reasoning)} chars of reasoning)")
+    print(f"model calls for guardrails: {engine.model_calls}, deduplicated checks: {engine.deduplicated}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
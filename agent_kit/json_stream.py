@@ -0,0 +1,113 @@
+import json
+from typing import Any, Iterator
+
+_LITERALS = ("true", "false", "null")
+
+
+class IncrementalJSONParser:
+    """Parses a streamed JSON object and reports each top-level field once complete.
+
+    ``feed`` takes the next text delta and yields ``(key, value)`` for every
+    top-level field whose value finished in it, so a caller can act on an early
+    field while later ones (e.g. a long ``reasoning`` string) are still streaming.
+    Text before the opening brace, such as a Markdown code fence, is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: dict[str, Any] = {}
+        self._pos = 0
+        self._state = "start"
+        self._key: str | None = None
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, delta: str) -> Iterator[tuple[str, Any]]:
+        self.buffer += delta
+        while self._pos < len(self.buffer) and self._state != "done":
+            char = self.buffer[self._pos]
+            state = self._state
+            if state == "start":
+                if char == "{":
+                    self._state = "key_or_end"
+            elif state in ("key_or_end", "after_value"):
+                if char == "}":
+                    self._state = "done"
+                elif char == '"' and state == "key_or_end":
+                    self._state, self._start = "key", self._pos
+                elif char == ",":
+                    self._state = "key_or_end"
+            elif state == "key":
+                if self._string_closed(char):
+                    self._key = json.loads(self.buffer[self._start:self._pos + 1])
+                    self._state = "colon"
+            elif state == "colon":
+                if char == ":":
+                    self._state = "value"
+            elif state == "value":
+                if not char.isspace():
+                    self._start = self._pos
+                    self._state = {'"': "string", "{": "nested", "[": "nested"}.get(char, "scalar")
+                    self._depth = 1 if self._state == "nested" else 0
+                    if self._state == "scalar":
+                        field = self._scalar_complete()
+                        if field is not None:
+                            yield field
+                            continue
+            elif state == "string":
+                if self._string_closed(char):
+                    yield self._complete(self._pos + 1)
+                    continue
+            elif state == "nested":
+                if self._in_string:
+                    self._string_closed(char)
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        yield self._complete(self._pos + 1)
+                        continue
+            elif state == "scalar":
+                field = self._scalar_complete()
+                if field is not None:
+                    yield field
+                    continue
+            self._pos += 1
+
+    def _string_closed(self, char: str) -> bool:
+        # Called for every character after an opening quote.
+        if self._escaped:
+            self._escaped = False
+            return False
+        if char == "\\":
+            self._escaped = True
+            return False
+        if char == '"':
+            self._in_string = False
+            return True
+        return False
+
+    def _scalar_complete(self) -> tuple[str, Any] | None:
+        text = self.buffer[self._start:self._pos + 1]
+        # Literals are complete as soon as their last letter arrives; numbers need a delimiter.
+        if text in _LITERALS:
+            return self._complete(self._pos + 1)
+        if text[-1] in ",}" or text[-1].isspace():
+            return self._complete(self._pos)
+        return None
+
+    def _complete(self, end: int) -> tuple[str, Any]:
+        value = json.loads(self.buffer[self._start:end])
+        self.fields[self._key] = value
+        self._state = "after_value"
+        self._pos = end
+        return self._key, value
@@ -0,0 +1,39 @@
+from typing import Any, AsyncIterator, Callable
+
+from agents import Model, ModelResponse
+
+
+class LazyModel(Model):
+    """A Model that builds the real one (and its HTTP client) on first use.
+
+    Importing an agent module then costs no client construction or API key
+    lookup, which keeps ``--help``, listing and profiling fast.
+    """
+
+    def __init__(self, factory: Callable[[], Model]):
+        self._factory = factory
+        self._model: Model | None = None
+
+    @property
+    def model(self) -> Model:
+        if self._model is None:
+            self._model = self._factory()
+        return self._model
+
+    @property
+    def is_built(self) -> bool:
+        return self._model is not None
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        return await self.model.get_response(*args, **kwargs)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async for event in self.model.stream_response(*args, **kwargs):
+            yield event
+
+
+def unwrap_model(model: Any) -> Any:
+    """Follow ThrottledModel/LazyModel wrappers down to the model that owns the client."""
+    while hasattr(model, "model") and not isinstance(model.model, str):
+        model = model.model
+    return model
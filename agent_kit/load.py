@@ -0,0 +1,300 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from agents import Agent, Runner
+
+from agent_kit.cli import load_agent_module
+
+
+@dataclass(frozen=True)
+class Workload:
+    """What one simulated request runs: an agent from the module, an input and a context.
+
+    ``agent`` is the module attribute holding the agent, or a function of the
+    module returning it (for agents built by the module's registry). ``reply`` is
+    the stand-in model's reply function, for workloads whose agent only does its
+    real work once the model calls its tools.
+    """
+    agent: str | Callable[[Any], Agent]
+    input: str
+    context: Callable[[Any], Any] | None = None
+    reply: Callable[[Any], Any] | None = None
+
+
+def call_every_tool(call: Any) -> Any:
+    """Stand-in reply that calls each offered tool with the user's text, then answers."""
+    from agent_kit.stand_in import ToolCall, default_reply, has_tool_output, last_user_text
+
+    if call.tools and not has_tool_output(call.input):
+        return [ToolCall(tool.name, {"input": last_user_text(call.input)}) for tool in call.tools]
+    return default_reply(call)
+
+
+def not_math_homework(call: Any) -> Any:
+    """Stand-in reply that clears practice's math homework guardrail, then calls every tool."""
+    if call.output_schema is not None and not call.output_schema.is_plain_text():
+        return json.dumps({"is_math_homework": False, "reasoning": "stand-in"})
+    return call_every_tool(call)
+
+
+# Agent subcommand -> workload. The context factory gets the imported module.
+WORKLOADS = {
+    "bank": Workload("bank_agent", "What is the balance of account 309473804?", lambda m: m.Account(name="Alishba", pin=1234)),
+    "mini-bank": Workload("bank_agent", "What is the balance of account 309473804?", lambda m: m.Account(name="Alishba", pin=1234)),
+    "code-explainer": Workload("code_explainer_agent", "for i in range(3):\n    print(i)"),
+    # The orchestrator fans out to its capital, language and population agents.
+    "country-info": Workload("orchestrator", "Tell me about France", reply=call_every_tool),
+    "library": Workload("library_agent", "Is Atomic Habits available?", lambda m: m.User(name="Alishba", member_id=1001)),
+    "support": Workload("triage_agent", "I need a refund for my order", lambda m: m.UserInfo(name="Alishba", is_premium_user=True)),
+    "practice": Workload(
+        lambda m: m.registry.get("Feedback Agent"), "How did I do?", lambda m: m.UserInfo(name="Alishba", score=95), not_math_homework
+    ),
+    "context": Workload(
+        lambda m: m.registry.get("Friendly Assistant"), "Am I allowed in?", lambda m: m.UserId(id=123), call_every_tool
+    ),
+    "mood": Workload(lambda m: m.registry.get("Mood Analyzer"), "Work is overwhelming"),
+    "smart-store": Workload(lambda m: m.registry.get("Smart Store Assistant"), "I have a headache."),
+    "lite-llm": Workload("agent", "Hi! Who are you?"),
+    "open-router": Workload("agent", "Hi! Who are you?"),
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a task that sleeps ``interval`` seconds.
+
+    Lag is time the loop spent on other work (SDK processing, blocking calls)
+    before it could run a ready callback; every request pays it at each await.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[tuple[float, float]] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append((start, max(0.0, loop.time() - start - self.interval)))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+@dataclass
+class LoadResult:
+    mode: str
+    level: float
+    duration: float
+    started: int = 0
+    latencies: list[tuple[float, float]] = field(default_factory=list)
+    errors: list[tuple[float, str]] = field(default_factory=list)
+    lag: list[tuple[float, float]] = field(default_factory=list)
+    in_flight: list[tuple[float, int]] = field(default_factory=list)
+
+    def summary(self) -> dict[str, Any]:
+        latencies = [latency for _, latency in self.latencies]
+        lags = [lag for _, lag in self.lag]
+        return {
+            "mode": self.mode,
+            "level": self.level,
+            "started": self.started,
+            "completed": len(latencies),
+            "errors": len(self.errors),
+            "throughput_per_s": round(len(latencies) / self.duration, 1),
+            "p50_ms": round(1000 * percentile(latencies, 0.5), 1),
+            "p95_ms": round(1000 * percentile(latencies, 0.95), 1),
+            "p99_ms": round(1000 * percentile(latencies, 0.99), 1),
+            "loop_lag_p99_ms": round(1000 * percentile(lags, 0.99), 1),
+            "loop_lag_max_ms": round(1000 * max(lags, default=0.0), 1),
+        }
+
+    def timeline(self, window: float = 1.0) -> list[dict[str, Any]]:
+        """Throughput, latency, loop lag and in-flight requests per ``window`` seconds."""
+        buckets = int(self.duration / window) + 1
+        rows = [{"t": round(i * window, 1), "done": 0, "latencies": [], "lags": [], "in_flight": 0} for i in range(buckets)]
+        for end, latency in self.latencies:
+            row = rows[min(buckets - 1, int(end / window))]
+            row["done"] += 1
+            row["latencies"].append(latency)
+        for at, lag in self.lag:
+            rows[min(buckets - 1, int(at / window))]["lags"].append(lag)
+        for at, count in self.in_flight:
+            row = rows[min(buckets - 1, int(at / window))]
+            row["in_flight"] = max(row["in_flight"], count)
+        return [
+            {
+                "t": row["t"],
+                "throughput_per_s": round(row["done"] / window, 1),
+                "p95_ms": round(1000 * percentile(row["latencies"], 0.95), 1),
+                "loop_lag_max_ms": round(1000 * max(row["lags"], default=0.0), 1),
+                "in_flight": row["in_flight"],
+            }
+            for row in rows
+        ]
+
+
+class LoadGenerator:
+    """Drives many concurrent runs of one agent inside this process.
+
+    Closed loop (``users``): each simulated user sends its next request as soon as
+    the previous one returns, so offered load drops when the system slows down.
+    Open loop (``rate``): requests start on a fixed schedule regardless of how many
+    are still in flight, which exposes queueing once the flow saturates.
+    """
+
+    def __init__(self, agent: Agent, input: str, context_factory: Callable[[], Any] | None, run_config: Any, lag_interval: float = 0.01):
+        self.agent = agent
+        self.input = input
+        self.context_factory = context_factory or (lambda: None)
+        self.run_config = run_config
+        self.lag_interval = lag_interval
+
+    async def _request(self, result: LoadResult, origin: float, in_flight: list[int]) -> None:
+        loop = asyncio.get_running_loop()
+        result.started += 1
+        in_flight[0] += 1
+        result.in_flight.append((loop.time() - origin, in_flight[0]))
+        start = loop.time()
+        try:
+            await Runner.run(self.agent, self.input, context=self.context_factory(), run_config=self.run_config)
+        except Exception as error:
+            result.errors.append((loop.time() - origin, type(error).__name__))
+        else:
+            result.latencies.append((loop.time() - origin, loop.time() - start))
+        finally:
+            in_flight[0] -= 1
+
+    async def closed_loop(self, users: int, duration: float) -> LoadResult:
+        return await self._drive(LoadResult("closed", users, duration), users=users)
+
+    async def open_loop(self, rate: float, duration: float) -> LoadResult:
+        return await self._drive(LoadResult("open", rate, duration), rate=rate)
+
+    async def _drive(self, result: LoadResult, users: int = 0, rate: float = 0.0) -> LoadResult:
+        loop = asyncio.get_running_loop()
+        monitor = LoopLagMonitor(self.lag_interval)
+        monitor.start()
+        origin = loop.time()
+        deadline = origin + result.duration
+        in_flight = [0]
+
+        async def user() -> None:
+            while loop.time() < deadline:
+                await self._request(result, origin, in_flight)
+
+        if users:
+            await asyncio.gather(*(user() for _ in range(users)))
+        else:
+            tasks = set()
+            # Fixed arrival times, so a slow loop sends a burst to catch up instead of backing off.
+            for n in range(int(rate * result.duration)):
+                await asyncio.sleep(max(0.0, origin + n / rate - loop.time()))
+                task = asyncio.create_task(self._request(result, origin, in_flight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        await monitor.stop()
+        # Requests still finishing after the deadline count toward the measured span.
+        result.duration = max(result.duration, loop.time() - origin)
+        result.lag = [(at - origin, lag) for at, lag in monitor.samples]
+        return result
+
+
+def prepare(name: str, latency: float = 0.5, jitter: float | None = None, live: bool = False) -> LoadGenerator:
+    """Import an agent module and point its run config and agents at a stand-in model."""
+    from agent_kit.run_cache import reachable_agents
+    from agent_kit.stand_in import StandInModel, default_reply
+
+    if name not in WORKLOADS:
+        raise ValueError(f"No load workload for {name!r}; expected one of {list(WORKLOADS)}")
+    workload = WORKLOADS[name]
+    module = load_agent_module(name)
+    agent = getattr(module, workload.agent) if isinstance(workload.agent, str) else workload.agent(module)
+    if not live:
+        stand_in = StandInModel(
+            latency=latency, jitter=latency / 2 if jitter is None else jitter, seed=0, reply=workload.reply or default_reply
+        )
+        module.config.model = stand_in
+        # Agents with their own model too: module-level ones (such as guardrail agents),
+        # registry-built ones and the agents reached through handoffs or as_tool.
+        module_agents = [value for value in vars(module).values() if isinstance(value, Agent)]
+        for value in module_agents + reachable_agents(agent):
+            if value.model is not None and not isinstance(value.model, str):
+                value.model = stand_in
+    context = (lambda: workload.context(module)) if workload.context else None
+    return LoadGenerator(agent, workload.input, context, module.config)
+
+
+async def sweep(
+    name: str,
+    mode: str = "closed",
+    levels: list[float] = (1, 4, 16, 64, 256),
+    duration: float = 10.0,
+    latency: float = 0.5,
+    live: bool = False,
+    window: float | None = None,
+    detect_blocking: float | None = None,
+) -> list[LoadResult]:
+    """Run each load level in turn, printing a summary line (and a timeline per ``window``).
+
+    With ``detect_blocking`` (seconds), callbacks that block the loop longer than
+    that are reported after each level.
+    """
+    from agents import set_tracing_disabled
+
+    from agent_kit.offload import BlockingDetector
+
+    set_tracing_disabled(True)
+    generator = prepare(name, latency=latency, live=live)
+    detector = None
+    if detect_blocking is not None:
+        detector = BlockingDetector(detect_blocking)
+        generator.agent = detector.watch(generator.agent)
+    results = []
+    for level in levels:
+        if mode == "closed":
+            result = await generator.closed_loop(int(level), duration)
+        else:
+            result = await generator.open_loop(level, duration)
+        results.append(result)
+        summary = result.summary()
+        print(
+            f"{mode} {level:>6g}: {summary['throughput_per_s']:>7.1f} req/s"
+            f"  p50 {summary['p50_ms']:>7.1f} ms  p95 {summary['p95_ms']:>7.1f} ms"
+            f"  loop lag p99 {summary['loop_lag_p99_ms']:>6.1f} ms  errors {summary['errors']}"
+        )
+        for row in result.timeline(window) if window else []:
+            print(
+                f"    t={row['t']:>5.1f}s  {row['throughput_per_s']:>7.1f} req/s  p95 {row['p95_ms']:>7.1f} ms"
+                f"  lag max {row['loop_lag_max_ms']:>6.1f} ms  in flight {row['in_flight']}"
+            )
+        if detector is not None:
+            for label, stats in detector.report().items():
+                print(f"    blocking: {label} x{stats['count']}, up to {stats['max_ms']:.0f} ms")
+            detector.events.clear()
+    return results
+
+
+async def main():
+    # Find where mini_bank_agent (agent + two guardrail runs per request) saturates.
+    await sweep("mini-bank", "closed", [1, 10, 50, 200, 500], duration=5.0, latency=0.5)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
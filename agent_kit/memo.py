@@ -0,0 +1,213 @@
+import asyncio
+import dataclasses
+import functools
+import inspect
+import json
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable
+
+from agents import FunctionTool, RunContextWrapper, function_tool
+from agents.tool import default_tool_error_function
+
+from agent_kit.offload import offload_sync
+
+
+_MISSING = object()
+
+
+@dataclasses.dataclass(eq=False)
+class ToolMemo:
+    """The result cache and counters for one pure tool.
+
+    ``generation`` goes up on every ``clear()``; a result computed across a
+    clear is stale and is not stored.
+    """
+    name: str
+    context_fields: tuple[str, ...]
+    depends_on: tuple[str, ...]
+    maxsize: int
+    results: OrderedDict = dataclasses.field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    generation: int = 0
+
+    def key(self, ctx: RunContextWrapper[Any], args_json: str) -> tuple:
+        args = json.dumps(json.loads(args_json or "{}"), sort_keys=True)
+        return (args, tuple(getattr(ctx.context, field) for field in self.context_fields))
+
+    def get(self, key: tuple) -> Any:
+        if key in self.results:
+            self.results.move_to_end(key)
+            self.hits += 1
+            return self.results[key]
+        self.misses += 1
+        return _MISSING
+
+    def put(self, key: tuple, value: Any) -> None:
+        self.results[key] = value
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+
+    def clear(self) -> None:
+        self.results.clear()
+        self.invalidations += 1
+        self.generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / calls, 3) if calls else 0.0,
+            "entries": len(self.results),
+            "invalidations": self.invalidations,
+        }
+
+
+# Every live pure tool's memo. Tools may share a name (a module imported both as
+# __main__ and as a package, or two agents defining the same tool); each keeps its own.
+_memos: "weakref.WeakSet[ToolMemo]" = weakref.WeakSet()
+
+
+def pure_tool(
+    func: Callable[..., Any] | None = None,
+    *,
+    context_fields: tuple[str, ...] = (),
+    depends_on: tuple[str, ...] = (),
+    maxsize: int = 1024,
+    failure_error_function: Callable[[RunContextWrapper[Any], Exception], str] | None = default_tool_error_function,
+    schema_cache: bool = False,
+    executor: str | None = "thread",
+    **tool_kwargs: Any,
+) -> FunctionTool | Callable[[Callable[..., Any]], FunctionTool]:
+    """``function_tool`` for tools whose result depends only on their arguments.
+
+    Results are cached per tool, keyed by the arguments plus the named
+    ``context_fields``, for the life of the process (across runs). Name the data
+    the tool reads in ``depends_on`` and call ``invalidate(name)`` (or decorate the
+    writer with ``@invalidates(name)``) when it changes. Errors are never cached.
+    With ``schema_cache=True`` the tool's JSON schema comes from the on-disk
+    schema cache (see ``agent_kit.registry``). Sync functions run in a worker pool
+    on a cache miss, as with ``offloaded_tool``; ``executor`` picks or disables it.
+    """
+
+    def decorate(func: Callable[..., Any]) -> FunctionTool:
+        func = offload_sync(func, executor)
+        if schema_cache:
+            from agent_kit.registry import cached_function_tool
+
+            tool = cached_function_tool(func, failure_error_function=None, **tool_kwargs)
+        else:
+            tool = function_tool(func, failure_error_function=None, **tool_kwargs)
+        memo = ToolMemo(tool.name, tuple(context_fields), tuple(depends_on), maxsize)
+        _memos.add(memo)
+        invoke = tool.on_invoke_tool
+
+        async def on_invoke_tool(ctx, args_json: str) -> Any:
+            try:
+                key = memo.key(ctx, args_json)
+                cached = memo.get(key)
+            except (ValueError, TypeError, AttributeError):
+                # Malformed arguments or an unhashable context field: run uncached, so
+                # the tool reports the error to the model as a plain function_tool would.
+                key = cached = _MISSING
+            if cached is not _MISSING:
+                return cached
+            generation = memo.generation
+            try:
+                result = await invoke(ctx, args_json)
+            except Exception as error:
+                if failure_error_function is None:
+                    raise
+                message = failure_error_function(ctx, error)
+                return await message if inspect.isawaitable(message) else message
+            # An invalidation while the tool ran may mean it read the old data.
+            if key is not _MISSING and memo.generation == generation:
+                memo.put(key, result)
+            return result
+
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+    return decorate(func) if func is not None else decorate
+
+
+def invalidate(dependency: str) -> None:
+    """Drop cached results of every pure tool that depends on ``dependency``."""
+    for memo in list(_memos):
+        if dependency in memo.depends_on:
+            memo.clear()
+
+
+def invalidates(*dependencies: str):
+    """Decorator for functions that change backing data: invalidates after each call."""
+
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    for dependency in dependencies:
+                        invalidate(dependency)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                for dependency in dependencies:
+                    invalidate(dependency)
+
+        return wrapper
+
+    return decorate
+
+
+def memo_stats() -> dict[str, dict[str, Any]]:
+    """Per-tool hit rates for every pure tool in the process, summed over tools sharing a name."""
+    totals: dict[str, dict[str, Any]] = {}
+    for memo in sorted(_memos, key=lambda memo: memo.name):
+        stats = memo.stats()
+        total = totals.setdefault(memo.name, dict.fromkeys(stats, 0))
+        for field in ("hits", "misses", "entries", "invalidations"):
+            total[field] += stats[field]
+    for total in totals.values():
+        calls = total["hits"] + total["misses"]
+        total["hit_rate"] = round(total["hits"] / calls, 3) if calls else 0.0
+    return totals
+
+
+async def main():
+    # The library tools with the model asking the same questions across several runs.
+    from agents import RunConfig, Runner
+
+    from agent_kit.stand_in import StandInCall, StandInModel, ToolCall, has_tool_output, last_user_text
+    from library_assistant.main import User, library_agent, set_copies
+
+    # The library tools registered with agent_kit.memo, not with this __main__ copy.
+    from agent_kit.memo import memo_stats
+
+    def reply(call: StandInCall):
+        if has_tool_output(call.input):
+            return "Here is what I found."
+        book = last_user_text(call.input)
+        return [ToolCall("search_book", {"book_name": book}), ToolCall("check_availability", {"book_name": book})]
+
+    config = RunConfig(model=StandInModel(latency=0.01, reply=reply), tracing_disabled=True)
+    agent = library_agent.clone(input_guardrails=[])
+    user = User(name="Alishba", member_id=1001)
+    for book in ["Atomic Habits", "The Great Gatsby", "Atomic Habits", "Atomic Habits", "The Great Gatsby"]:
+        await Runner.run(agent, book, context=user, run_config=config)
+    set_copies("Atomic Habits", 4)
+    await Runner.run(agent, "Atomic Habits", context=user, run_config=config)
+    for name, stats in memo_stats().items():
+        print(name, stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
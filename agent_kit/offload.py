@@ -0,0 +1,258 @@
+import asyncio
+import contextvars
+import dataclasses
+import functools
+import importlib
+import inspect
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from agents import Agent, FunctionTool, function_tool
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ("thread", "process")
+
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+_pool_sizes = {"thread": min(32, (os.cpu_count() or 1) + 4), "process": os.cpu_count() or 1}
+
+# (module, qualified name) -> the undecorated function, for process-pool workers.
+_process_functions: dict[tuple[str, str], Callable[..., Any]] = {}
+
+
+def configure_pools(threads: int | None = None, processes: int | None = None) -> None:
+    """Set the pool sizes; takes effect for pools not created yet."""
+    if threads is not None:
+        _pool_sizes["thread"] = threads
+    if processes is not None:
+        _pool_sizes["process"] = processes
+
+
+def get_executor(kind: str) -> Executor:
+    global _thread_pool, _process_pool
+    if kind == "thread":
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=_pool_sizes["thread"], thread_name_prefix="agent_kit-tool")
+        return _thread_pool
+    if kind == "process":
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=_pool_sizes["process"])
+        return _process_pool
+    raise ValueError(f"Unknown executor {kind!r}, expected one of {list(EXECUTORS)}")
+
+
+def shutdown_pools(wait: bool = True) -> None:
+    global _thread_pool, _process_pool
+    for pool in (_thread_pool, _process_pool):
+        if pool is not None:
+            pool.shutdown(wait=wait)
+    _thread_pool = _process_pool = None
+
+
+def _call_registered(module: str, qualname: str, args: tuple, kwargs: dict) -> Any:
+    # Runs in a worker process: importing the module registers the function again.
+    if (module, qualname) not in _process_functions:
+        importlib.import_module(module)
+    return _process_functions[(module, qualname)](*args, **kwargs)
+
+
+def offloaded(func: Callable[..., Any] | None = None, *, executor: str = "thread"):
+    """Run a sync function in a worker pool and give the event loop an awaitable instead.
+
+    ``offloaded_tool`` and ``pure_tool`` apply it to sync tools automatically, so a
+    tool doing blocking I/O stops stalling every other run on the loop. Threads (the default, a
+    bounded shared pool) suit I/O; ``executor="process"`` suits CPU-heavy work,
+    which threads cannot parallelize. Process-pool functions must be module-level
+    and must not take the run context, since their arguments are pickled.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}, expected one of {list(EXECUTORS)}")
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(func):
+            raise TypeError(f"{func.__qualname__} is already async; offloading is for blocking functions.")
+        if executor == "process":
+            key = (func.__module__, func.__qualname__)
+            _process_functions[key] = func
+
+            @functools.wraps(func)
+            async def in_process(*args: Any, **kwargs: Any) -> Any:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(get_executor("process"), _call_registered, *key, args, kwargs)
+
+            return in_process
+
+        @functools.wraps(func)
+        async def in_thread(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            # Copy the context so lanes and other context variables follow the call.
+            call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+            return await loop.run_in_executor(get_executor("thread"), call)
+
+        return in_thread
+
+    return decorate(func) if func is not None else decorate
+
+
+def offload_sync(func: Callable[..., Any], executor: str | None = "thread") -> Callable[..., Any]:
+    """``func`` offloaded to the ``executor`` pool if it is sync; async functions and ``executor=None`` keep it as is."""
+    if executor is None or inspect.iscoroutinefunction(func):
+        return func
+    return offloaded(func, executor=executor)
+
+
+def offloaded_tool(
+    func: Callable[..., Any] | None = None, *, executor: str | None = "thread", **tool_kwargs: Any
+) -> FunctionTool | Callable[[Callable[..., Any]], FunctionTool]:
+    """``function_tool`` that never runs a sync tool on the event loop.
+
+    Sync functions go to the shared thread pool, or the process pool with
+    ``executor="process"``; ``executor=None`` opts out for functions too cheap to be
+    worth a thread hop. Async functions are used as they are.
+    """
+
+    def decorate(func: Callable[..., Any]) -> FunctionTool:
+        return function_tool(offload_sync(func, executor), **tool_kwargs)
+
+    return decorate(func) if func is not None else decorate
+
+
+@dataclasses.dataclass
+class BlockingEvent:
+    label: str
+    seconds: float
+
+
+class _Timed:
+    """Awaitable that times each synchronous step of a coroutine on the loop."""
+
+    def __init__(self, coro: Any, detector: "BlockingDetector", label: str):
+        self.coro = coro
+        self.detector = detector
+        self.label = label
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            start = time.perf_counter()
+            try:
+                step = self.coro.throw(error) if error is not None else self.coro.send(value)
+            except StopIteration as stop:
+                self.detector.check(self.label, time.perf_counter() - start)
+                return stop.value
+            self.detector.check(self.label, time.perf_counter() - start)
+            try:
+                value, error = (yield step), None
+            except BaseException as raised:
+                value, error = None, raised
+
+
+class BlockingDetector:
+    """Debug aid: flags tool, ``is_enabled`` and guardrail callbacks that block the loop.
+
+    ``watch(agent)`` returns an instrumented copy of the agent and of its handoffs,
+    and the original agents are left untouched. Each stretch of synchronous work
+    longer than ``threshold`` seconds (a whole sync callback, or one step between
+    awaits of an async one) is logged as a warning and kept in ``events``.
+    """
+
+    def __init__(self, threshold: float = 0.05):
+        self.threshold = threshold
+        self.events: list[BlockingEvent] = []
+        # id(original) -> its instrumented copy, so each agent is copied once.
+        self._watched: dict[int, Agent] = {}
+
+    def check(self, label: str, seconds: float) -> None:
+        if seconds > self.threshold:
+            self.events.append(BlockingEvent(label, seconds))
+            logger.warning("%s blocked the event loop for %.0f ms", label, 1000 * seconds)
+
+    def _timed(self, func: Callable[..., Any], label: str) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            if inspect.iscoroutine(result):
+                self.check(label, time.perf_counter() - start)
+                return _Timed(result, self, label)
+            self.check(label, time.perf_counter() - start)
+            return result
+
+        return timed
+
+    def watch(self, agent: Agent) -> Agent:
+        watched = self._watched.get(id(agent))
+        if watched is not None:
+            return watched
+        tools = []
+        for tool in agent.tools:
+            if isinstance(tool, FunctionTool):
+                changes = {"on_invoke_tool": self._timed(tool.on_invoke_tool, f"tool {tool.name}")}
+                if callable(tool.is_enabled):
+                    changes["is_enabled"] = self._timed(tool.is_enabled, f"is_enabled of {tool.name}")
+                tool = dataclasses.replace(tool, **changes)
+            tools.append(tool)
+        guardrails = {}
+        for field in ("input_guardrails", "output_guardrails"):
+            guardrails[field] = [
+                dataclasses.replace(
+                    guardrail,
+                    guardrail_function=self._timed(guardrail.guardrail_function, f"guardrail {guardrail.get_name()}"),
+                    name=guardrail.get_name(),
+                )
+                for guardrail in getattr(agent, field)
+            ]
+        watched = self._watched[id(agent)] = agent.clone(tools=tools, **guardrails)
+        # Registered before the handoffs are copied, so handoff cycles end here.
+        watched.handoffs = [self.watch(handoff) if isinstance(handoff, Agent) else handoff for handoff in agent.handoffs]
+        return watched
+
+    def report(self) -> dict[str, dict[str, float]]:
+        by_label: dict[str, dict[str, float]] = {}
+        for event in self.events:
+            stats = by_label.setdefault(event.label, {"count": 0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["max_ms"] = max(stats["max_ms"], round(1000 * event.seconds, 1))
+        return by_label
+
+
+async def main():
+    # A tool that sleeps 50 ms in a blocking call, on the loop and then offloaded.
+    from agents import RunConfig, Runner
+
+    from agent_kit.load import LoopLagMonitor, percentile
+    from agent_kit.stand_in import StandInCall, StandInModel, ToolCall, has_tool_output
+
+    def lookup(account_number: str) -> str:
+        """Look up an account in a slow backing store."""
+        time.sleep(0.05)
+        return f"Account {account_number} found."
+
+    def reply(call: StandInCall):
+        return "Done." if has_tool_output(call.input) else [ToolCall("lookup", {"account_number": "309473804"})]
+
+    config = RunConfig(model=StandInModel(latency=0.05, reply=reply), tracing_disabled=True)
+    for label, tool in [("on the loop", function_tool(lookup)), ("offloaded", offloaded_tool(lookup))]:
+        detector = BlockingDetector(threshold=0.02)
+        agent = detector.watch(Agent(name="Lookup Agent", instructions="Look up accounts.", tools=[tool]))
+        monitor = LoopLagMonitor()
+        monitor.start()
+        start = time.perf_counter()
+        await asyncio.gather(*(Runner.run(agent, "Find my account", run_config=config) for _ in range(50)))
+        elapsed = time.perf_counter() - start
+        await monitor.stop()
+        lags = [lag for _, lag in monitor.samples]
+        print(
+            f"{label:<12} 50 runs in {elapsed:.2f}s, loop lag p99 {1000 * percentile(lags, 0.99):.0f} ms,"
+            f" blocking events: {detector.report() or 'none'}"
+        )
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(main())
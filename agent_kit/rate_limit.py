@@ -0,0 +1,326 @@
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator
+
+import openai
+from agents import Model, ModelResponse
+
+# Lower number = served first. Guardrail checks gate every user request, so they
+# must never wait behind bulk jobs.
+LANES = {"guardrail": 0, "interactive": 1, "bulk": 2}
+
+current_lane: ContextVar[str] = ContextVar("agent_kit_lane", default="interactive")
+
+THROTTLE_STATUSES = (429, 503)
+
+
+@contextmanager
+def priority_lane(name: str):
+    """Run the model calls made inside this block in the given lane."""
+    if name not in LANES:
+        raise ValueError(f"Unknown lane {name!r}, expected one of {list(LANES)}")
+    token = current_lane.set(name)
+    try:
+        yield
+    finally:
+        current_lane.reset(token)
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Read the Retry-After header (seconds or HTTP date) from an API error."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_call_tokens(system_instructions: str | None, input: Any, max_output_tokens: int | None) -> int:
+    prompt = (system_instructions or "") + (input if isinstance(input, str) else json.dumps(input, default=str))
+    return len(prompt) // 4 + (max_output_tokens or 256)
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at ``per_minute`` tokens per minute."""
+
+    def __init__(self, per_minute: float, burst: float | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        # May go negative: an underestimate is paid back before the next call runs.
+        self._refill()
+        self.tokens -= amount
+
+
+class RateLimitScheduler:
+    """Process-wide admission control for model calls.
+
+    Calls are admitted in lane priority order when the request and token buckets
+    allow it and fewer than ``limit`` calls are in flight. The limit grows by one
+    per ``limit`` successful calls and halves on 429/503 responses (AIMD); a
+    Retry-After header pauses admission for every lane.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 15,
+        tokens_per_minute: float = 1_000_000,
+        initial_concurrency: float = 4,
+        min_concurrency: float = 1,
+        max_concurrency: float = 64,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.limit = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self._waiters: list[tuple[int, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.stats = {lane: {"calls": 0, "wait_s": 0.0, "throttled": 0} for lane in LANES}
+
+    async def acquire(self, lane: str, tokens: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (LANES[lane], next(self._sequence), tokens, future))
+        start = time.monotonic()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.in_flight -= 1
+                self._dispatch()
+            raise
+        self.stats[lane]["calls"] += 1
+        self.stats[lane]["wait_s"] += time.monotonic() - start
+
+    def release(self, lane: str, used_tokens: int = 0, estimated_tokens: int = 0, error: BaseException | None = None) -> None:
+        self.in_flight -= 1
+        self.tokens.take(used_tokens - estimated_tokens)
+        now = time.monotonic()
+        status = getattr(error, "status_code", None)
+        if status in THROTTLE_STATUSES:
+            self.stats[lane]["throttled"] += 1
+            # Halve at most once per second so one burst of 429s doesn't collapse the limit.
+            if now - self.last_decrease > 1.0:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                self.last_decrease = now
+            retry_after = retry_after_seconds(error)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+        elif error is None:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            _, _, cost, future = self._waiters[0]
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight >= int(self.limit):
+                return
+            delay = max(
+                self.paused_until - time.monotonic(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(cost),
+            )
+            if delay > 0:
+                self._schedule(delay)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(cost)
+            self.in_flight += 1
+            future.set_result(None)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None and not self._timer.cancelled():
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def report(self) -> dict[str, Any]:
+        lanes = {
+            lane: {
+                "calls": stats["calls"],
+                "avg_wait_ms": round(1000 * stats["wait_s"] / stats["calls"], 1) if stats["calls"] else 0.0,
+                "throttled": stats["throttled"],
+            }
+            for lane, stats in self.stats.items()
+        }
+        return {"concurrency_limit": round(self.limit, 2), "in_flight": self.in_flight, "lanes": lanes}
+
+
+_scheduler: RateLimitScheduler | None = None
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """The scheduler shared by every ThrottledModel in this process."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RateLimitScheduler()
+    return _scheduler
+
+
+def configure(**kwargs: Any) -> RateLimitScheduler:
+    """Replace the process-wide scheduler, e.g. ``configure(requests_per_minute=2000)``."""
+    global _scheduler
+    _scheduler = RateLimitScheduler(**kwargs)
+    return _scheduler
+
+
+class ThrottledModel(Model):
+    """Wraps a Model so every call goes through the process-wide scheduler.
+
+    Throttled calls (429/503) are retried up to ``max_retries`` times, after the
+    Retry-After delay or a jittered exponential backoff. Create the OpenAI client
+    with ``max_retries=0`` so the scheduler sees every throttled response.
+    """
+
+    def __init__(self, model: Model, lane: str | None = None, max_retries: int = 5, scheduler: RateLimitScheduler | None = None):
+        self.model = model
+        self.lane = lane
+        self.max_retries = max_retries
+        self._scheduler = scheduler
+
+    @property
+    def scheduler(self) -> RateLimitScheduler:
+        return self._scheduler or get_scheduler()
+
+    def _lane(self) -> str:
+        return self.lane or current_lane.get()
+
+    async def _backoff(self, attempt: int, error: BaseException) -> None:
+        if retry_after_seconds(error) is None:
+            await asyncio.sleep(random.uniform(0, min(30.0, 0.5 * 2 ** attempt)))
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        lane = self._lane()
+        estimate = estimate_call_tokens(system_instructions, input, model_settings.max_tokens)
+        for attempt in range(self.max_retries + 1):
+            await self.scheduler.acquire(lane, estimate)
+            try:
+                response = await self.model.get_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                )
+            except openai.APIStatusError as error:
+                self.scheduler.release(lane, estimate, estimate, error)
+                if error.status_code not in THROTTLE_STATUSES or attempt == self.max_retries:
+                    raise
+                await self._backoff(attempt, error)
+                continue
+            except BaseException as error:
+                self.scheduler.release(lane, estimate, estimate, error)
+                raise
+            self.scheduler.release(lane, response.usage.total_tokens or estimate, estimate)
+            return response
+        raise AssertionError("unreachable")
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        lane = self._lane()
+        estimate = estimate_call_tokens(system_instructions, input, model_settings.max_tokens)
+        for attempt in range(self.max_retries + 1):
+            await self.scheduler.acquire(lane, estimate)
+            used, started = estimate, False
+            try:
+                async for event in self.model.stream_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                ):
+                    started = True
+                    if event.type == "response.completed" and event.response.usage:
+                        used = event.response.usage.total_tokens
+                    yield event
+            except openai.APIStatusError as error:
+                self.scheduler.release(lane, estimate, estimate, error)
+                # Only retry before anything reached the caller.
+                if started or error.status_code not in THROTTLE_STATUSES or attempt == self.max_retries:
+                    raise
+                await self._backoff(attempt, error)
+                continue
+            except BaseException as error:
+                self.scheduler.release(lane, estimate, estimate, error)
+                raise
+            self.scheduler.release(lane, used, estimate)
+            return
+
+
+async def main():
+    from agents import Agent, RunConfig, Runner
+
+    from agent_kit.stand_in import StandInModel
+
+    stand_in = StandInModel(latency=0.05, jitter=0.03, error_rate=0.1, error_status=429, retry_after=0.2, seed=7)
+    configure(requests_per_minute=6000, tokens_per_minute=2_000_000, initial_concurrency=8)
+    config = RunConfig(model=ThrottledModel(stand_in), tracing_disabled=True)
+    agent = Agent(name="Assistant", instructions="You are a Helpful Assistant.")
+
+    async def bulk(i: int):
+        with priority_lane("bulk"):
+            await Runner.run(agent, f"Summarise document {i}", run_config=config)
+
+    async def guardrail(i: int):
+        await asyncio.sleep(0.1 * i)
+        with priority_lane("guardrail"):
+            await Runner.run(agent, f"Is request {i} bank related?", run_config=config)
+
+    start = time.monotonic()
+    await asyncio.gather(*(bulk(i) for i in range(150)), *(guardrail(i) for i in range(10)))
+    print(f"160 runs in {time.monotonic() - start:.2f}s, stand-in saw {stand_in.calls} calls")
+    print(get_scheduler().report())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,299 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Any, Callable
+
+import pydantic
+from agents import Agent, AgentOutputSchema, AgentOutputSchemaBase, FunctionTool, function_tool
+from importlib.metadata import version
+
+DEFAULT_SCHEMA_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "agent_kit", "schemas.json")
+
+# A schema generated by one SDK or pydantic version is not reused by another.
+_GENERATOR = f"openai-agents {version('openai-agents')}, pydantic {pydantic.VERSION}"
+
+
+def source_hash(obj: Any) -> str:
+    """Hash of the source file defining ``obj`` (plus the schema generator versions).
+
+    The whole file is hashed, so a change to any model a signature refers to in
+    the same module also invalidates the schema.
+    """
+    try:
+        with open(inspect.getsourcefile(obj), "rb") as file:
+            source = file.read()
+    except (OSError, TypeError):
+        source = repr(obj).encode()
+    return hashlib.sha256(source + _GENERATOR.encode()).hexdigest()[:16]
+
+
+class SchemaCache:
+    """Generated JSON schemas on disk, each stored with the source hash it came from."""
+
+    def __init__(self, path: str = DEFAULT_SCHEMA_CACHE_PATH):
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def entries(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    self._entries = json.load(file)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str, digest: str) -> dict[str, Any] | None:
+        entry = self.entries.get(key)
+        if entry is None or entry["hash"] != digest:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["value"]
+
+    def put(self, key: str, digest: str, value: dict[str, Any]) -> None:
+        self.entries[key] = {"hash": digest, "value": value}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file.
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self.entries, file)
+        os.replace(temporary, self.path)
+
+
+_schema_cache: SchemaCache | None = None
+
+
+def get_schema_cache() -> SchemaCache:
+    """The process-wide schema cache, at ``AGENT_KIT_SCHEMA_CACHE`` if set."""
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = SchemaCache(os.getenv("AGENT_KIT_SCHEMA_CACHE", DEFAULT_SCHEMA_CACHE_PATH))
+    return _schema_cache
+
+
+def cached_function_tool(func: Callable[..., Any] | None = None, *, cache: SchemaCache | None = None, **tool_kwargs: Any):
+    """``function_tool`` that takes its JSON schema from the schema cache.
+
+    While the function's source file is unchanged the tool is assembled from the
+    cached schema without generating pydantic models; the real tool, which parses
+    arguments, is built when it is first invoked.
+    """
+
+    def decorate(func: Callable[..., Any]) -> FunctionTool:
+        schemas = cache or get_schema_cache()
+        key = f"tool:{func.__module__}.{func.__qualname__}"
+        options = {name: value for name, value in tool_kwargs.items() if isinstance(value, (str, bool, type(None)))}
+        digest = f"{source_hash(inspect.unwrap(func))}:{json.dumps(options, sort_keys=True)}"
+        cached = schemas.get(key, digest)
+        if cached is None:
+            tool = function_tool(func, **tool_kwargs)
+            schemas.put(
+                key,
+                digest,
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "params_json_schema": tool.params_json_schema,
+                    "strict_json_schema": tool.strict_json_schema,
+                },
+            )
+            return tool
+
+        real: FunctionTool | None = None
+
+        async def on_invoke_tool(ctx, args_json: str) -> Any:
+            nonlocal real
+            if real is None:
+                real = function_tool(func, **tool_kwargs)
+            return await real.on_invoke_tool(ctx, args_json)
+
+        return FunctionTool(on_invoke_tool=on_invoke_tool, is_enabled=tool_kwargs.get("is_enabled", True), **cached)
+
+    return decorate(func) if func is not None else decorate
+
+
+class CachedOutputSchema(AgentOutputSchemaBase):
+    """An agent output schema served from the schema cache; validation is built on first use."""
+
+    def __init__(self, output_type: type[Any], cached: dict[str, Any]):
+        self.output_type = output_type
+        self.cached = cached
+        self._schema: AgentOutputSchema | None = None
+
+    @property
+    def schema(self) -> AgentOutputSchema:
+        if self._schema is None:
+            self._schema = AgentOutputSchema(self.output_type)
+        return self._schema
+
+    def is_plain_text(self) -> bool:
+        return False
+
+    def name(self) -> str:
+        return self.cached["name"]
+
+    def json_schema(self) -> dict[str, Any]:
+        return self.cached["json_schema"]
+
+    def is_strict_json_schema(self) -> bool:
+        return self.cached["strict"]
+
+    def validate_json(self, json_str: str) -> Any:
+        return self.schema.validate_json(json_str)
+
+
+class AgentRegistry:
+    """Builds each agent once, on first request, and hands out that same instance.
+
+    Register factories with ``@registry.define(name)`` and fetch agents with
+    ``registry.get(name)``. Structured ``output_type`` schemas are generated once
+    here (the runner would otherwise rebuild them every turn), and with a
+    ``schema_cache`` they are read from disk while their source is unchanged.
+    """
+
+    def __init__(self, schema_cache: SchemaCache | None = None):
+        self.schema_cache = schema_cache
+        self.factories: dict[str, Callable[[], Agent[Any]]] = {}
+        self.agents: dict[str, Agent[Any]] = {}
+        self.build_seconds: dict[str, float] = {}
+
+    def define(self, name: str):
+        def register(factory: Callable[[], Agent[Any]]) -> Callable[[], Agent[Any]]:
+            self.factories[name] = factory
+            self.agents.pop(name, None)
+            return factory
+
+        return register
+
+    def get(self, name: str) -> Agent[Any]:
+        agent = self.agents.get(name)
+        if agent is None:
+            start = time.perf_counter()
+            agent = self.prepare(self.factories[name]())
+            self.build_seconds[name] = time.perf_counter() - start
+            self.agents[name] = agent
+        return agent
+
+    def warm(self) -> None:
+        """Build every registered agent now, e.g. before serving requests."""
+        for name in self.factories:
+            self.get(name)
+
+    def prepare(self, agent: Agent[Any], _seen: set[int] | None = None) -> Agent[Any]:
+        seen = _seen if _seen is not None else set()
+        if id(agent) in seen:
+            return agent
+        seen.add(id(agent))
+        output_type = agent.output_type
+        if output_type is not None and output_type is not str and not isinstance(output_type, AgentOutputSchemaBase):
+            agent.output_type = self.output_schema(output_type)
+        for handoff in agent.handoffs:
+            if isinstance(handoff, Agent):
+                self.prepare(handoff, seen)
+        return agent
+
+    def output_schema(self, output_type: type[Any]) -> AgentOutputSchemaBase:
+        if self.schema_cache is None:
+            return AgentOutputSchema(output_type)
+        key = f"output:{output_type.__module__}.{output_type.__qualname__}"
+        digest = source_hash(output_type)
+        cached = self.schema_cache.get(key, digest)
+        if cached is None:
+            schema = AgentOutputSchema(output_type)
+            cached = {"name": schema.name(), "json_schema": schema.json_schema(), "strict": schema.is_strict_json_schema()}
+            self.schema_cache.put(key, digest, cached)
+            return schema
+        return CachedOutputSchema(output_type, cached)
+
+
+# Agent subcommand -> module, for the modules that define their agents in a registry.
+REGISTRY_MODULES = {
+    "context": "context.context",
+    "practice": "practice.main",
+    "smart-store": "smart_store_agent.product_suggester",
+    "mood": "mood_analyzer_with_handoffs.mood_handoff",
+}
+
+
+def main(repeats: int = 3):
+    """Startup of the registry-based agents, with an empty and a filled schema cache."""
+    import subprocess
+    import tempfile
+
+    from pydantic import BaseModel
+
+    from agent_kit.cli import REPO_ROOT
+
+    directory = tempfile.mkdtemp()
+
+    # One tool schema: generated by function_tool, then read from the cache.
+    class Address(BaseModel):
+        street: str
+        city: str
+
+    def ship_order(order_id: int, address: Address, express: bool = False) -> str:
+        """Ship an order to an address."""
+        return f"Order {order_id} shipped."
+
+    cache = SchemaCache(os.path.join(directory, "tools.json"))
+    cached_function_tool(ship_order, cache=cache)
+    timings = {}
+    for label, build in [("function_tool", function_tool), ("cached_function_tool", lambda f: cached_function_tool(f, cache=cache))]:
+        start = time.perf_counter()
+        for _ in range(100):
+            build(ship_order)
+        timings[label] = (time.perf_counter() - start) * 10
+    print(f"tool schema: generated {timings['function_tool']:.2f} ms, from cache {timings['cached_function_tool']:.3f} ms")
+
+    # What every main() call used to pay, against a registry lookup.
+    from practice.main import MathHomeworkOutput, registry
+
+    start = time.perf_counter()
+    for _ in range(100):
+        AgentOutputSchema(MathHomeworkOutput)
+        Agent(name="Feedback Agent", instructions="You give feedback based on the user's score.")
+    inline = (time.perf_counter() - start) * 10
+    start = time.perf_counter()
+    for _ in range(100):
+        registry.get("Feedback Agent")
+    lookup = (time.perf_counter() - start) * 10
+    print(f"per main() call: building agents and output schema {inline:.2f} ms, registry lookup {lookup:.4f} ms")
+
+    # Fresh processes: importing the module (the SDK import dominates) and building its agents.
+    probe = (
+        "import time; start = time.perf_counter(); import {module} as m; imported = time.perf_counter();"
+        " m.registry.warm(); print((imported - start) * 1000, (time.perf_counter() - imported) * 1000)"
+    )
+    cache_path = os.path.join(directory, "schemas.json")
+    for name, module in REGISTRY_MODULES.items():
+        best = {}
+        for state in ("empty", "filled"):
+            runs = []
+            for _ in range(repeats):
+                if state == "empty" and os.path.exists(cache_path):
+                    os.remove(cache_path)
+                completed = subprocess.run(
+                    [sys.executable, "-c", probe.format(module=module)],
+                    cwd=REPO_ROOT,
+                    env={**os.environ, "AGENT_KIT_SCHEMA_CACHE": cache_path},
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                runs.append([float(value) for value in completed.stdout.split()])
+            best[state] = min(runs)
+        print(
+            f"{name:<12} import + build, best of {repeats}: empty cache {best['empty'][0]:.0f} + {best['empty'][1]:.1f} ms,"
+            f" filled cache {best['filled'][0]:.0f} + {best['filled'][1]:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
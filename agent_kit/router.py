@@ -0,0 +1,235 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator
+
+from agents import Agent, Model, ModelResponse, RunConfig, Runner
+
+
+class RouteStats:
+    """Rolling latency and error statistics for one provider."""
+
+    def __init__(self, window: int = 50):
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.failure_streak = 0
+        self.cooldown_until = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.hedges_won = 0
+
+    def record_success(self, latency: float) -> None:
+        self.calls += 1
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.failure_streak = 0
+
+    def record_failure(self, cooldown: float, max_failure_streak: int) -> None:
+        self.calls += 1
+        self.errors += 1
+        self.outcomes.append(False)
+        self.failure_streak += 1
+        if self.failure_streak >= max_failure_streak:
+            self.cooldown_until = time.monotonic() + cooldown
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def summary(self) -> dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "hedges_won": self.hedges_won,
+        }
+
+
+class LatencyRouterModel(Model):
+    """A Model that sends each call to the fastest healthy provider.
+
+    Providers are ranked by their rolling median latency. A provider is taken out
+    of rotation for ``cooldown`` seconds after ``max_failure_streak`` failures in a
+    row, or while its rolling error rate is above ``max_error_rate``. Failed calls
+    fall over to the next provider. With ``hedge=True`` a duplicate request is sent
+    to the runner-up once the primary has taken longer than its p95 latency, and
+    whichever answers first wins.
+    """
+
+    def __init__(
+        self,
+        providers: dict[str, Model],
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        max_error_rate: float = 0.5,
+        max_failure_streak: int = 3,
+        cooldown: float = 30.0,
+        explore_ratio: float = 0.05,
+        window: int = 50,
+    ):
+        if not providers:
+            raise ValueError("LatencyRouterModel needs at least one provider.")
+        self.providers = providers
+        self.stats = {name: RouteStats(window) for name in providers}
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.max_error_rate = max_error_rate
+        self.max_failure_streak = max_failure_streak
+        self.cooldown = cooldown
+        self.explore_ratio = explore_ratio
+        self._random = random.Random()
+
+    def _is_healthy(self, name: str) -> bool:
+        stats = self.stats[name]
+        if time.monotonic() < stats.cooldown_until:
+            return False
+        return len(stats.outcomes) < 5 or stats.error_rate <= self.max_error_rate
+
+    def ranked(self) -> list[str]:
+        """Provider names, best first. Unhealthy providers are only used as a last resort."""
+        def key(name: str) -> tuple[bool, float]:
+            p50 = self.stats[name].percentile(0.5)
+            # Providers without samples go first so every route gets measured.
+            return (not self._is_healthy(name), p50 if p50 is not None else -1.0)
+
+        names = sorted(self.providers, key=key)
+        healthy = [name for name in names if self._is_healthy(name)]
+        if len(healthy) > 1 and self._random.random() < self.explore_ratio:
+            # Occasionally try a slower route so its statistics don't go stale.
+            explored = self._random.choice(healthy[1:])
+            names.remove(explored)
+            names.insert(0, explored)
+        return names
+
+    def _hedge_delay(self, name: str) -> float | None:
+        p95 = self.stats[name].percentile(0.95)
+        if p95 is None:
+            return None
+        return max(p95, self.hedge_min_delay)
+
+    async def _call(self, name: str, args: tuple, kwargs: dict) -> ModelResponse:
+        start = time.monotonic()
+        try:
+            response = await self.providers[name].get_response(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats[name].record_failure(self.cooldown, self.max_failure_streak)
+            raise
+        self.stats[name].record_success(time.monotonic() - start)
+        return response
+
+    async def _hedged_call(
+        self, primary: str, backup: str, args: tuple, kwargs: dict, attempted: set[str]
+    ) -> ModelResponse:
+        first = asyncio.create_task(self._call(primary, args, kwargs))
+        done, _ = await asyncio.wait({first}, timeout=self._hedge_delay(primary))
+        if done:
+            return first.result()
+
+        attempted.add(backup)
+        second = asyncio.create_task(self._call(backup, args, kwargs))
+        pending = {first, second}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.stats[backup].hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        names = self.ranked()
+        # A hedged call may already have tried the next provider; it is not asked twice.
+        attempted: set[str] = set()
+        error: Exception | None = None
+        for name in names:
+            if name in attempted:
+                continue
+            attempted.add(name)
+            backup = next((other for other in names if other not in attempted), None)
+            try:
+                if self.hedge and backup is not None and self._hedge_delay(name) is not None:
+                    return await self._hedged_call(name, backup, args, kwargs, attempted)
+                return await self._call(name, args, kwargs)
+            except Exception as exc:
+                error = exc
+        raise error
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        # Streams are not hedged; they fall over only until the first event arrives.
+        error: Exception | None = None
+        for name in self.ranked():
+            # Latency is the time spent waiting on the provider up to response.completed,
+            # not the time the consumer spends handling the events we yield.
+            latency = 0.0
+            completed = False
+            started = False
+            try:
+                resumed = time.monotonic()
+                async for event in self.providers[name].stream_response(*args, **kwargs):
+                    if not completed:
+                        latency += time.monotonic() - resumed
+                        completed = event.type == "response.completed"
+                    started = True
+                    yield event
+                    resumed = time.monotonic()
+            except Exception as exc:
+                self.stats[name].record_failure(self.cooldown, self.max_failure_streak)
+                if started:
+                    raise
+                error = exc
+                continue
+            self.stats[name].record_success(latency)
+            return
+        raise error
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+
+async def main():
+    # Local stand-in endpoints: one fast but flaky, one steady, one slow.
+    from agent_kit.stand_in import StandInModel
+
+    router = LatencyRouterModel(
+        {
+            "fast-flaky": StandInModel("fast-flaky", latency=0.02, jitter=0.01, error_rate=0.2, seed=1),
+            "steady": StandInModel("steady", latency=0.05, jitter=0.04, seed=2),
+            "slow": StandInModel("slow", latency=0.2, seed=3),
+        },
+        hedge=True,
+        cooldown=1.0,
+    )
+    config = RunConfig(model=router, tracing_disabled=True)
+    agent = Agent(name="Assistant", instructions="You are a Helpful Assistant.")
+
+    start = time.monotonic()
+    for batch in range(10):
+        await asyncio.gather(*(Runner.run(agent, f"Question {batch}.{i}", run_config=config) for i in range(20)))
+    print(f"200 runs in {time.monotonic() - start:.2f}s")
+    for name, summary in router.report().items():
+        print(name, summary)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
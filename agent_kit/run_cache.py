@@ -0,0 +1,287 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from agents import Agent, FunctionTool, RunConfig, RunContextWrapper, Runner
+from agents.items import ToolCallItem
+from pydantic import BaseModel, TypeAdapter
+
+from agent_kit.lazy import unwrap_model
+
+# Tools that change something in the outside world. A run that can reach one of
+# these is never answered from, or written to, the cache.
+SIDE_EFFECT_TOOLS: set[str] = {"issue_refund", "restart_service"}
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "agent_kit", "runs.sqlite3")
+
+
+def side_effecting(tool: FunctionTool) -> FunctionTool:
+    """Mark a tool as side-effecting so runs that can call it bypass the cache."""
+    SIDE_EFFECT_TOOLS.add(tool.name)
+    return tool
+
+
+def _digest(value: Any) -> str:
+    # No default=str: object reprs carry memory addresses, which would make the key differ per process.
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+
+def tool_agents(tool: Any) -> list[Agent]:
+    """The agents a tool runs, for tools made with ``Agent.as_tool``.
+
+    The SDK keeps no reference to the agent on the tool, only in the closure of
+    its invoke function, so the closures are searched (through any wrappers).
+    """
+    found: list[Agent] = []
+    seen: set[int] = set()
+    pending = [getattr(tool, "on_invoke_tool", None)]
+    while pending:
+        func = pending.pop()
+        func = getattr(func, "__func__", func)
+        if id(func) in seen:
+            continue
+        seen.add(id(func))
+        for cell in getattr(func, "__closure__", None) or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                continue
+            if isinstance(value, Agent):
+                found.append(value)
+            elif callable(value):
+                pending.append(value)
+    return found
+
+
+def reachable_agents(agent: Agent) -> list[Agent]:
+    """The agent plus every agent it can hand off to or call as a tool, directly or indirectly."""
+    seen: dict[int, Agent] = {}
+    pending = [agent]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen[id(current)] = current
+        pending.extend(handoff for handoff in current.handoffs if isinstance(handoff, Agent))
+        for tool in current.tools:
+            pending.extend(tool_agents(tool))
+    return list(seen.values())
+
+
+def model_name(model: Any) -> str:
+    """The model name behind any wrappers, or the model class name if it has none."""
+    model = unwrap_model(model)
+    if isinstance(model, str):
+        return model
+    name = getattr(model, "model", None)
+    return name if isinstance(name, str) else type(model).__name__
+
+
+def _tool_schema(tool: Any) -> dict[str, Any]:
+    if isinstance(tool, FunctionTool):
+        return {"name": tool.name, "description": tool.description, "parameters": tool.params_json_schema}
+    return {"name": getattr(tool, "name", type(tool).__name__)}
+
+
+@dataclass
+class CachedRunResult:
+    """What a cache hit returns in place of a RunResult."""
+    final_output: Any
+    last_agent_name: str
+    cached: bool = True
+
+
+class RunCache:
+    """An on-disk cache of whole agent runs, keyed on everything that shapes the answer.
+
+    The key covers, for the starting agent and every agent reachable from it
+    through handoffs or agent tools, a hash of its resolved instructions, a hash of
+    its tool and handoff schemas, the effective model settings and the model name,
+    plus the context and the input. Runs whose context or input is not JSON have
+    no key and are not cached. Entries are evicted least-recently-used once the
+    store grows past ``max_bytes``. ``cached_run`` does the SQLite reads and writes
+    in a worker thread, so they are serialized with a lock.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 64 * 1024 * 1024):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "key TEXT PRIMARY KEY, agent TEXT, value TEXT, size INTEGER, created REAL, last_used REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS runs_last_used ON runs(last_used)")
+        self._db.commit()
+
+    async def key(self, agent: Agent, input: Any, context: Any, run_config: RunConfig) -> str:
+        wrapper = RunContextWrapper(context=context)
+        # The starting agent first, then every agent it can hand off to or call as a tool.
+        agents = [agent] + sorted(reachable_agents(agent)[1:], key=lambda current: current.name)
+        return _digest(
+            {
+                "agent": agent.name,
+                "agents": [await self._agent_state(current, wrapper, run_config) for current in agents],
+                "context": _dump(context),
+                "input": input,
+            }
+        )
+
+    async def _agent_state(self, agent: Agent, wrapper: RunContextWrapper[Any], run_config: RunConfig) -> dict[str, Any]:
+        tools = await agent.get_all_tools(wrapper)
+        return {
+            "name": agent.name,
+            "instructions": _digest(await agent.get_system_prompt(wrapper)),
+            "tools": _digest(
+                [_tool_schema(tool) for tool in tools]
+                + [getattr(handoff, "name", None) or getattr(handoff, "agent_name", None) for handoff in agent.handoffs]
+            ),
+            "model": model_name(run_config.model or agent.model),
+            "model_settings": agent.model_settings.resolve(run_config.model_settings).to_json_dict(),
+        }
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM runs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE runs SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, agent_name: str, value: dict[str, Any]) -> None:
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                (key, agent_name, payload, len(payload), now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM runs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Evict down to 90% so we don't evict again on the very next insert.
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        for key, size in self._db.execute("SELECT key, size FROM runs ORDER BY last_used").fetchall():
+            if freed >= target:
+                break
+            self._db.execute("DELETE FROM runs WHERE key = ?", (key,))
+            freed += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM runs")
+            self._db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM runs").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "bypassed": self.bypassed, "entries": entries, "bytes": size}
+
+
+def can_reach_side_effects(agent: Agent) -> bool:
+    return any(
+        getattr(tool, "name", None) in SIDE_EFFECT_TOOLS for current in reachable_agents(agent) for tool in current.tools
+    )
+
+
+def called_side_effects(result: Any) -> bool:
+    return any(
+        isinstance(item, ToolCallItem) and getattr(item.raw_item, "name", None) in SIDE_EFFECT_TOOLS
+        for item in result.new_items
+    )
+
+
+_default_cache: RunCache | None = None
+
+
+def get_cache() -> RunCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RunCache()
+    return _default_cache
+
+
+async def cached_run(
+    agent: Agent,
+    input: Any,
+    *,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+    cache: RunCache | None = None,
+    **kwargs: Any,
+) -> Any:
+    """``Runner.run`` that answers repeated runs from the cache.
+
+    Returns a CachedRunResult on a hit and the normal RunResult otherwise. Runs that
+    can reach a side-effecting tool always go to the model.
+    """
+    cache = cache or await asyncio.to_thread(get_cache)
+    run_config = run_config or RunConfig()
+    if can_reach_side_effects(agent):
+        cache.bypassed += 1
+        return await Runner.run(agent, input, context=context, run_config=run_config, **kwargs)
+
+    agents_by_name = {current.name: current for current in reachable_agents(agent)}
+    try:
+        key = await cache.key(agent, input, context, run_config)
+    except TypeError:
+        cache.bypassed += 1
+        return await Runner.run(agent, input, context=context, run_config=run_config, **kwargs)
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is not None and entry["agent"] in agents_by_name:
+        cache.hits += 1
+        output_type = agents_by_name[entry["agent"]].output_type or str
+        return CachedRunResult(TypeAdapter(output_type).validate_json(entry["output"]), entry["agent"])
+
+    cache.misses += 1
+    result = await Runner.run(agent, input, context=context, run_config=run_config, **kwargs)
+    if not called_side_effects(result):
+        output_type = result.last_agent.output_type or str
+        output = TypeAdapter(output_type).dump_json(result.final_output).decode()
+        await asyncio.to_thread(cache.put, key, result.last_agent.name, {"agent": result.last_agent.name, "output": output})
+    return result
+
+
+async def main():
+    import tempfile
+
+    from agent_kit.stand_in import StandInModel
+
+    stand_in = StandInModel(latency=0.2)
+    config = RunConfig(model=stand_in, tracing_disabled=True)
+    agent = Agent(name="Capital Agent", instructions="Return ONLY the capital city when given a country name.")
+    cache = RunCache(os.path.join(tempfile.mkdtemp(), "runs.sqlite3"))
+
+    for country in ["France", "Brazil", "France", "Germany", "Brazil", "France"]:
+        start = time.monotonic()
+        result = await cached_run(agent, country, run_config=config, cache=cache)
+        source = "cache" if isinstance(result, CachedRunResult) else "model"
+        print(f"{country:<8} {source:<5} {1000 * (time.monotonic() - start):6.1f} ms  {result.final_output}")
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,227 @@
+"""Serve the bank agents over HTTP (ASGI).
+
+    python -m agent_kit serve bank --port 8000
+    python -m agent_kit serve-bench bank --requests 2000 --concurrency 100
+
+Endpoints:
+    POST /run     {"input": "...", "context": {"name": "...", "pin": 1234}} -> {"final_output": ...}
+    POST /stream  same body, answered as Server-Sent Events
+    GET  /healthz
+
+Starlette and uvicorn are installed with openai-agents (through its MCP support).
+"""
+import asyncio
+import contextlib
+import json
+import time
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from agents import InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered, Runner
+
+from agent_kit.cli import load_agent_module
+from agent_kit.lazy import unwrap_model
+
+# Subcommand -> (agent attribute, context model attribute) in the agent module.
+SERVABLE = {
+    "bank": ("bank_agent", "Account"),
+    "mini-bank": ("bank_agent", "Account"),
+}
+
+
+def jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+
+class Limiter:
+    """Caps concurrent runs and rejects requests once too many are already queued."""
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_queue = max_queue
+        self.waiting = 0
+        self.in_flight = 0
+        self.draining = False
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def accepts(self) -> bool:
+        return not self.draining and self.waiting < self.max_queue
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.idle.clear()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.semaphore.release()
+            if self.in_flight == 0:
+                self.idle.set()
+
+
+def create_app(name: str, max_concurrency: int = 64, max_queue: int = 256, drain_timeout: float = 30.0) -> Starlette:
+    module = load_agent_module(name)
+    agent_attr, context_attr = SERVABLE[name]
+    agent = getattr(module, agent_attr)
+    context_type = getattr(module, context_attr)
+    config = module.config
+    limiter = Limiter(max_concurrency, max_queue)
+
+    def overloaded() -> JSONResponse:
+        return JSONResponse({"error": "overloaded"}, status_code=503, headers={"Retry-After": "1"})
+
+    async def parse(request: Request) -> tuple[str, Any]:
+        body = await request.json()
+        if not isinstance(body, dict):
+            raise TypeError(f"expected a JSON object, got {type(body).__name__}")
+        return body["input"], context_type.model_validate(body.get("context", {}))
+
+    async def run(request: Request) -> JSONResponse:
+        if not limiter.accepts():
+            return overloaded()
+        try:
+            user_input, context = await parse(request)
+        except (KeyError, TypeError, ValueError, ValidationError) as error:
+            return JSONResponse({"error": "bad_request", "detail": str(error)}, status_code=400)
+        async with limiter.slot():
+            try:
+                result = await Runner.run(agent, user_input, context=context, run_config=config)
+            except (InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered) as tripped:
+                return JSONResponse({"error": "guardrail_tripped", "guardrail": type(tripped).__name__}, status_code=422)
+        return JSONResponse({"final_output": jsonable(result.final_output), "last_agent": result.last_agent.name})
+
+    async def stream(request: Request) -> StreamingResponse | JSONResponse:
+        if not limiter.accepts():
+            return overloaded()
+        try:
+            user_input, context = await parse(request)
+        except (KeyError, TypeError, ValueError, ValidationError) as error:
+            return JSONResponse({"error": "bad_request", "detail": str(error)}, status_code=400)
+
+        def sse(event: str, data: Any) -> str:
+            return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+        async def events():
+            async with limiter.slot():
+                result = Runner.run_streamed(agent, user_input, context=context, run_config=config)
+                try:
+                    async for event in result.stream_events():
+                        if event.type == "raw_response_event":
+                            if event.data.type == "response.output_text.delta":
+                                yield sse("delta", {"delta": event.data.delta})
+                        elif event.type == "agent_updated_stream_event":
+                            yield sse("agent", {"name": event.new_agent.name})
+                        elif event.type == "run_item_stream_event":
+                            yield sse("item", {"name": event.name})
+                    yield sse("done", {"final_output": jsonable(result.final_output)})
+                except (InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered) as tripped:
+                    yield sse("error", {"error": "guardrail_tripped", "guardrail": type(tripped).__name__})
+                finally:
+                    # Client went away (or we finished): stop the run instead of letting it burn tokens.
+                    result.cancel()
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    async def healthz(request: Request) -> JSONResponse:
+        return JSONResponse({"in_flight": limiter.in_flight, "waiting": limiter.waiting, "draining": limiter.draining})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        # Build the shared client before the first request so no request pays for it.
+        unwrap_model(config.model)
+        yield
+        limiter.draining = True
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.idle.wait(), drain_timeout)
+        client = getattr(unwrap_model(config.model), "_client", None)
+        if client is not None:
+            await client.close()
+
+    return Starlette(
+        routes=[
+            Route("/run", run, methods=["POST"]),
+            Route("/stream", stream, methods=["POST"]),
+            Route("/healthz", healthz, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def serve(name: str, host: str = "127.0.0.1", port: int = 8000, **limits: Any) -> None:
+    import uvicorn
+
+    uvicorn.run(create_app(name, **limits), host=host, port=port, timeout_graceful_shutdown=30, log_level="info")
+
+
+async def bench(
+    name: str,
+    requests: int = 1000,
+    concurrency: int = 50,
+    latency: float = 0.05,
+    streamed: bool = False,
+    port: int = 8765,
+) -> dict[str, Any]:
+    """Serve ``name`` against a stand-in model on localhost and hammer it over HTTP."""
+    import httpx
+    import uvicorn
+
+    from agent_kit.stand_in import StandInModel
+
+    module = load_agent_module(name)
+    module.config.model = StandInModel(latency=latency, jitter=latency / 2, seed=0)
+    app = create_app(name, max_concurrency=concurrency, max_queue=requests)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    body = {"input": "I want to check my balance. My account number is 309473804", "context": {"name": "Alishba", "pin": 1234}}
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    pending = iter(range(requests))
+
+    async def user(client: httpx.AsyncClient):
+        for _ in pending:
+            start = time.perf_counter()
+            if streamed:
+                async with client.stream("POST", "/stream", json=body) as response:
+                    async for _ in response.aiter_lines():
+                        pass
+            else:
+                response = await client.post("/run", json=body)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(user(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    server.should_exit = True
+    await server_task
+    latencies.sort()
+    return {
+        "agent": name,
+        "mode": "stream" if streamed else "run",
+        "requests": requests,
+        "concurrency": concurrency,
+        "requests_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(1000 * latencies[len(latencies) // 2], 1),
+        "p95_ms": round(1000 * latencies[int(len(latencies) * 0.95)], 1),
+        "statuses": statuses,
+    }
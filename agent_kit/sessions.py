@@ -0,0 +1,176 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+
+class Session:
+    """One customer's isolated context and state, served by its own task."""
+
+    __slots__ = ("id", "context", "state", "inbox", "task", "busy", "last_active", "turns")
+
+    def __init__(self, session_id: str, context: Any):
+        self.id = session_id
+        self.context = context
+        self.state: dict[str, Any] | None = None
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.task: asyncio.Task | None = None
+        self.busy = False
+        self.last_active = time.monotonic()
+        self.turns = 0
+
+
+class SessionManager:
+    """Serves many concurrent sessions from one process.
+
+    Every session owns its context (built by ``context_factory``) and processes its
+    messages in order on its own asyncio task, so one slow customer never blocks
+    another and no state is shared between them. A session's task ends after
+    ``idle_ttl`` seconds without messages, and the least recently used idle
+    session (no message queued or in progress) is evicted once there are more
+    than ``max_sessions``. Messages still pending when a session's task ends are
+    cancelled, so no ``submit()`` waits forever.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Session, Any], Awaitable[Any]],
+        context_factory: Callable[[str], Any],
+        max_sessions: int = 10_000,
+        idle_ttl: float = 900.0,
+    ):
+        self.handler = handler
+        self.context_factory = context_factory
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.sessions: OrderedDict[str, Session] = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+
+    def get(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session(session_id, self.context_factory(session_id))
+            session.task = asyncio.create_task(self._serve(session), name=f"session-{session_id}")
+            self._evict_lru(keep=session_id)
+        self.sessions.move_to_end(session_id)
+        return session
+
+    async def submit(self, session_id: str, message: Any) -> Any:
+        """Queue a message for the session and wait for the handler's result."""
+        future = asyncio.get_running_loop().create_future()
+        self.get(session_id).inbox.put_nowait((message, future))
+        return await future
+
+    async def _serve(self, session: Session) -> None:
+        future: asyncio.Future | None = None
+        try:
+            while True:
+                try:
+                    message, future = await asyncio.wait_for(session.inbox.get(), self.idle_ttl)
+                except asyncio.TimeoutError:
+                    self.expired += 1
+                    return
+                session.busy = True
+                session.last_active = time.monotonic()
+                session.turns += 1
+                try:
+                    result = await self.handler(session, message)
+                except Exception as error:
+                    if not future.done():
+                        future.set_exception(error)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                session.busy = False
+                session.last_active = time.monotonic()
+        finally:
+            session.busy = False
+            if self.sessions.get(session.id) is session:
+                del self.sessions[session.id]
+            if future is not None and not future.done():
+                future.cancel()
+            while not session.inbox.empty():
+                _, pending = session.inbox.get_nowait()
+                if not pending.done():
+                    pending.cancel()
+
+    def _evict_lru(self, keep: str | None = None) -> None:
+        if len(self.sessions) <= self.max_sessions:
+            return
+        for session_id, session in list(self.sessions.items()):
+            if len(self.sessions) <= self.max_sessions:
+                return
+            # Never drop a session with work queued or in progress; it is evicted once it goes quiet.
+            if session_id != keep and not session.busy and session.inbox.empty() and session.task is not None:
+                del self.sessions[session_id]
+                session.task.cancel()
+                self.evicted += 1
+
+    async def close(self) -> None:
+        tasks = [session.task for session in self.sessions.values() if session.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.sessions.clear()
+
+
+async def main(sessions: int = 10_000, turns: int = 2):
+    """Simulate ``sessions`` concurrent support customers against a stand-in model."""
+    import random
+    import tracemalloc
+
+    from agents import Runner
+
+    from agent_kit.stand_in import StandInModel
+    from support_agent_system.main import UserInfo, config, route_issue, triage_agent
+
+    config.model = StandInModel(latency=0.2, jitter=0.1, seed=0)
+    messages = ["I need a refund for my order", "Please restart the email service", "How do I change my address?"]
+
+    async def handle(session: Session, user_input: str) -> str:
+        session.context.issue_type = route_issue(user_input)
+        await Runner.run(triage_agent, user_input, context=session.context, run_config=config)
+        return session.context.issue_type
+
+    manager = SessionManager(handle, lambda session_id: UserInfo(name=session_id, is_premium_user=True))
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(sessions):
+        manager.get(f"customer-{i}")
+    await asyncio.sleep(0)
+    idle_bytes = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+
+    latencies: list[float] = []
+    mismatches = 0
+
+    async def customer(i: int):
+        nonlocal mismatches
+        rng = random.Random(i)
+        for _ in range(turns):
+            message = rng.choice(messages)
+            start = time.perf_counter()
+            issue_type = await manager.submit(f"customer-{i}", message)
+            latencies.append(time.perf_counter() - start)
+            mismatches += issue_type != route_issue(message)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(customer(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{sessions} sessions x {turns} turns in {elapsed:.1f}s ({sessions * turns / elapsed:.0f} turns/s)")
+    print(f"turn latency p50 {1000 * latencies[len(latencies) // 2]:.0f} ms, p95 {1000 * latencies[int(len(latencies) * 0.95)]:.0f} ms")
+    print(f"idle session footprint ~{idle_bytes / sessions:.0f} bytes, isolation mismatches: {mismatches}")
+    await manager.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the session manager with simulated support customers.")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.turns))
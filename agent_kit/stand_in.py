@@ -0,0 +1,338 @@
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+import httpx
+import openai
+from agents import Model, ModelResponse, Usage
+from agents.models.fake_id import FAKE_RESPONSES_ID
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseContentPartAddedEvent,
+    ResponseContentPartDoneEvent,
+    ResponseCreatedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputItemAddedEvent,
+    ResponseOutputItemDoneEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+
+@dataclass
+class ToolCall:
+    """A tool call the stand-in should make instead of answering with text."""
+    name: str
+    arguments: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class StandInCall:
+    """Everything the stand-in was asked for a single model call."""
+    system_instructions: str | None
+    input: Any
+    tools: list[Any]
+    output_schema: Any
+    handoffs: list[Any]
+    model_settings: Any = None
+    input_tokens: int = 0
+    cached_tokens: int = 0
+
+
+Reply = Callable[[StandInCall], "str | list[ToolCall]"]
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token, good enough for local measurements.
+    return max(1, len(text) // 4)
+
+
+def last_user_text(input: Any) -> str:
+    if isinstance(input, str):
+        return input
+    for item in reversed(input):
+        if isinstance(item, dict) and item.get("role") == "user":
+            content = item.get("content")
+            if isinstance(content, str):
+                return content
+            return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def has_tool_output(input: Any) -> bool:
+    return not isinstance(input, str) and any(
+        isinstance(item, dict) and item.get("type") == "function_call_output" for item in input
+    )
+
+
+def sample_for_schema(schema: dict[str, Any], defs: dict[str, Any] | None = None) -> Any:
+    """Build a value that satisfies a (strict) JSON schema, e.g. a guardrail output."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_for_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        return sample_for_schema(schema["anyOf"][0], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: sample_for_schema(prop, defs) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind == "boolean":
+        return True
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "null":
+        return None
+    return "stand-in"
+
+
+def default_reply(call: StandInCall) -> str | list[ToolCall]:
+    if call.output_schema is not None and not call.output_schema.is_plain_text():
+        return json.dumps(sample_for_schema(call.output_schema.json_schema()))
+    return f"Stand-in answer to: {last_user_text(call.input)}"
+
+
+def api_error(status: int, retry_after: float | None = None) -> openai.APIStatusError:
+    """Build the same exception the OpenAI client raises for an HTTP error status."""
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    request = httpx.Request("POST", "http://stand-in.local/v1/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    if status == 429:
+        return openai.RateLimitError("Rate limit exceeded", response=response, body=None)
+    if status >= 500:
+        return openai.InternalServerError("Service unavailable", response=response, body=None)
+    return openai.APIStatusError(f"HTTP {status}", response=response, body=None)
+
+
+class StandInModel(Model):
+    """A local model that answers without the network.
+
+    Latency, jitter and error responses are injected so routing, rate limiting
+    and load tests can be exercised offline and deterministically (pass ``seed``).
+
+    With ``prefix_cache=True`` it also simulates provider-side prompt caching:
+    the prompt (tool schemas, then system instructions, then input) is cached in
+    blocks of ``cache_block_tokens``, a call reuses the longest previously seen
+    prefix, and only the uncached tokens pay ``prefill_latency_per_token``.
+
+    Streamed text arrives in ``chunk_size`` pieces, ``chunk_latency`` seconds apart.
+    """
+
+    def __init__(
+        self,
+        name: str = "stand-in",
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: float | None = None,
+        reply: Reply = default_reply,
+        chunk_size: int = 16,
+        chunk_latency: float = 0.0,
+        seed: int | None = None,
+        prefix_cache: bool = False,
+        cache_block_tokens: int = 128,
+        prefill_latency_per_token: float = 0.0,
+        cache_entries: int = 10_000,
+    ):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.chunk_latency = chunk_latency
+        self.prefix_cache = prefix_cache
+        self.cache_block_tokens = cache_block_tokens
+        self.prefill_latency_per_token = prefill_latency_per_token
+        self.cache_entries = cache_entries
+        self.calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self._random = random.Random(seed)
+        self._cached_prefixes: OrderedDict[str, None] = OrderedDict()
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    @staticmethod
+    def _prompt_text(call: StandInCall) -> str:
+        tools = [getattr(tool, "params_json_schema", getattr(tool, "name", "")) for tool in call.tools]
+        return json.dumps(tools, default=str) + (call.system_instructions or "") + json.dumps(call.input, default=str)
+
+    def _cached_prefix_tokens(self, prompt: str) -> int:
+        """Look up, then remember, every block-aligned prefix of the prompt."""
+        block = self.cache_block_tokens * 4
+        cached, still_matching = 0, True
+        for end in range(block, len(prompt) + 1, block):
+            key = hashlib.sha1(prompt[:end].encode()).hexdigest()
+            if still_matching and key in self._cached_prefixes:
+                cached = end // 4
+                self._cached_prefixes.move_to_end(key)
+                continue
+            still_matching = False
+            self._cached_prefixes[key] = None
+            if len(self._cached_prefixes) > self.cache_entries:
+                self._cached_prefixes.popitem(last=False)
+        return cached
+
+    async def _prepare(self, system_instructions, input, model_settings, tools, output_schema, handoffs):
+        self.calls += 1
+        call = StandInCall(system_instructions, input, tools, output_schema, handoffs, model_settings)
+        prompt = self._prompt_text(call)
+        call.input_tokens = estimate_tokens(prompt)
+        call.cached_tokens = self._cached_prefix_tokens(prompt) if self.prefix_cache else 0
+        self.input_tokens += call.input_tokens
+        self.cached_tokens += call.cached_tokens
+        prefill = (call.input_tokens - call.cached_tokens) * self.prefill_latency_per_token
+        await asyncio.sleep(self._delay() + prefill)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise api_error(self.error_status, self.retry_after)
+        return call, self.reply(call)
+
+    def _usage(self, call: StandInCall, output_text: str) -> Usage:
+        output_tokens = estimate_tokens(output_text)
+        return Usage(
+            requests=1,
+            input_tokens=call.input_tokens,
+            input_tokens_details=InputTokensDetails(cached_tokens=call.cached_tokens),
+            output_tokens=output_tokens,
+            total_tokens=call.input_tokens + output_tokens,
+        )
+
+    @staticmethod
+    def _output_items(answer: str | list[ToolCall]) -> list[Any]:
+        if isinstance(answer, str):
+            return [
+                ResponseOutputMessage(
+                    id=FAKE_RESPONSES_ID,
+                    content=[ResponseOutputText(text=answer, type="output_text", annotations=[])],
+                    role="assistant",
+                    status="completed",
+                    type="message",
+                )
+            ]
+        return [
+            ResponseFunctionToolCall(
+                id=FAKE_RESPONSES_ID,
+                call_id=f"call_{index}_{tool_call.name}",
+                arguments=json.dumps(tool_call.arguments),
+                name=tool_call.name,
+                type="function_call",
+            )
+            for index, tool_call in enumerate(answer)
+        ]
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        prompt=None,
+        **kwargs,
+    ) -> ModelResponse:
+        call, answer = await self._prepare(system_instructions, input, model_settings, tools, output_schema, handoffs)
+        text = answer if isinstance(answer, str) else json.dumps([tc.arguments for tc in answer])
+        return ModelResponse(output=self._output_items(answer), usage=self._usage(call, text), response_id=None)
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        prompt=None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        call, answer = await self._prepare(system_instructions, input, model_settings, tools, output_schema, handoffs)
+        sequence = iter(range(1_000_000))
+        response = Response(
+            id=FAKE_RESPONSES_ID,
+            created_at=time.time(),
+            model=self.name,
+            object="response",
+            output=[],
+            tool_choice="auto",
+            tools=[],
+            parallel_tool_calls=False,
+        )
+        yield ResponseCreatedEvent(response=response, type="response.created", sequence_number=next(sequence))
+
+        outputs = self._output_items(answer)
+        if isinstance(answer, str):
+            message = ResponseOutputMessage(
+                id=FAKE_RESPONSES_ID, content=[], role="assistant", status="in_progress", type="message"
+            )
+            yield ResponseOutputItemAddedEvent(
+                item=message, output_index=0, type="response.output_item.added", sequence_number=next(sequence)
+            )
+            yield ResponseContentPartAddedEvent(
+                content_index=0,
+                item_id=FAKE_RESPONSES_ID,
+                output_index=0,
+                part=ResponseOutputText(text="", type="output_text", annotations=[]),
+                type="response.content_part.added",
+                sequence_number=next(sequence),
+            )
+            # Yield control between chunks so streams interleave like real ones.
+            chunks = [answer[i:i + self.chunk_size] for i in range(0, len(answer), self.chunk_size)] or [""]
+            for chunk in chunks:
+                await asyncio.sleep(self.chunk_latency)
+                yield ResponseTextDeltaEvent(
+                    content_index=0,
+                    delta=chunk,
+                    item_id=FAKE_RESPONSES_ID,
+                    output_index=0,
+                    type="response.output_text.delta",
+                    sequence_number=next(sequence),
+                    logprobs=[],
+                )
+            yield ResponseContentPartDoneEvent(
+                content_index=0,
+                item_id=FAKE_RESPONSES_ID,
+                output_index=0,
+                part=outputs[0].content[0],
+                type="response.content_part.done",
+                sequence_number=next(sequence),
+            )
+        for index, item in enumerate(outputs):
+            yield ResponseOutputItemDoneEvent(
+                item=item, output_index=index, type="response.output_item.done", sequence_number=next(sequence)
+            )
+
+        text = answer if isinstance(answer, str) else json.dumps([tc.arguments for tc in answer])
+        usage = self._usage(call, text)
+        final_response = response.model_copy()
+        final_response.output = outputs
+        final_response.usage = ResponseUsage(
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            total_tokens=usage.total_tokens,
+            input_tokens_details=InputTokensDetails(cached_tokens=usage.input_tokens_details.cached_tokens),
+            output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+        )
+        yield ResponseCompletedEvent(response=final_response, type="response.completed", sequence_number=next(sequence))
@@ -0,0 +1,167 @@
+import asyncio
+import dataclasses
+from collections import deque
+from typing import Any, AsyncIterator, Iterable
+
+from agents import Agent, ItemHelpers, Model, ModelResponse, RunConfig, Runner, StreamEvent
+from openai.types.responses import ResponseCompletedEvent
+
+class RawEventFilterModel(Model):
+    """Passes through only the raw stream events someone will read.
+
+    The runner needs nothing but ``response.completed`` to finish a turn, so every
+    other raw event (one per text delta) is dropped here, before the runner wraps
+    it and queues it for the consumer.
+    """
+
+    def __init__(self, model: Model, keep: Iterable[str] = ()):
+        self.model = model
+        self.keep = frozenset(keep)
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        return await self.model.get_response(*args, **kwargs)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async for event in self.model.stream_response(*args, **kwargs):
+            if event.type in self.keep or isinstance(event, ResponseCompletedEvent):
+                yield event
+
+
+def compact_item(item: Any, max_chars: int) -> tuple[str, str, str]:
+    """(item type, agent name, text) with the text cut to ``max_chars``."""
+    if item.type == "message_output_item":
+        text = ItemHelpers.text_message_output(item)
+    elif item.type == "tool_call_output_item":
+        text = str(item.output)
+    elif item.type == "tool_call_item":
+        text = getattr(item.raw_item, "name", "")
+    else:
+        text = ""
+    if len(text) > max_chars:
+        text = text[:max_chars] + f"... [{len(text) - max_chars} more chars]"
+    return item.type, item.agent.name, text
+
+
+class Transcript:
+    """The last ``maxlen`` run items a session kept, as small tuples.
+
+    Only the item type, agent name and (truncated) text are stored, so big tool
+    outputs and response objects are released as soon as the turn ends.
+    """
+
+    def __init__(self, maxlen: int = 50, max_chars: int = 2000):
+        self.items: deque[tuple[str, str, str]] = deque(maxlen=maxlen)
+        self.max_chars = max_chars
+
+    def append(self, item: Any) -> None:
+        self.items.append(compact_item(item, self.max_chars))
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+async def stream_events(
+    starting_agent: Agent[Any],
+    input: Any,
+    consume: Iterable[str],
+    *,
+    run_config: RunConfig | None = None,
+    transcript: Transcript | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[StreamEvent]:
+    """``Runner.run_streamed`` that yields only the events named in ``consume``.
+
+    Names are stream event types (``agent_updated_stream_event``), run item types
+    (``message_output_item``, ``tool_call_output_item``...) or raw model event
+    types (``response.output_text.delta``). Raw events that are not asked for are
+    dropped by a wrapper around ``run_config.model`` as the model yields them, so the
+    runner never wraps or queues them; the model still builds them. Consumed run
+    items are also appended to ``transcript`` when one is given.
+
+    ``run_config.model`` must be a Model instance, since a model name or the
+    agents' own models could not be wrapped.
+    """
+    consume = frozenset(consume)
+    run_config = run_config or RunConfig()
+    if run_config.model is None or isinstance(run_config.model, str):
+        raise ValueError(
+            f"stream_events needs run_config.model to be a Model instance, got {run_config.model!r}; "
+            "use Runner.run_streamed to stream without filtering"
+        )
+    run_config = dataclasses.replace(run_config, model=RawEventFilterModel(run_config.model, consume))
+    result = Runner.run_streamed(starting_agent, input, run_config=run_config, **kwargs)
+    async for event in result.stream_events():
+        if event.type == "raw_response_event":
+            if event.data.type not in consume:
+                continue
+        elif event.type == "run_item_stream_event":
+            if event.item.type not in consume and event.type not in consume:
+                continue
+            if transcript is not None:
+                transcript.append(event.item)
+        elif event.type not in consume:
+            continue
+        yield event
+
+
+async def main(turns: int = 200, reply_chars: int = 20_000):
+    """Memory of a long streamed support session: everything kept versus bounded streaming."""
+    import gc
+    import time
+    import tracemalloc
+
+    from agent_kit.stand_in import StandInModel
+    from support_agent_system.main import UserInfo, triage_agent
+
+    config = RunConfig(
+        model=StandInModel(latency=0.0, reply=lambda call: "Here is what happened with your order. " * (reply_chars // 40)),
+        tracing_disabled=True,
+    )
+    agent = triage_agent.clone(output_guardrails=[])
+    context = UserInfo(name="Alishba", is_premium_user=True)
+
+    async def unbounded() -> list[Any]:
+        # The usual pattern: keep each turn's result (for history) and read all events.
+        kept = []
+        for turn in range(turns):
+            result = Runner.run_streamed(agent, f"Question {turn}", context=context, run_config=config)
+            async for _ in result.stream_events():
+                pass
+            kept.append(result)
+        return kept
+
+    async def discard() -> None:
+        # support_agent_system before: read every event, keep nothing after the turn.
+        for turn in range(turns):
+            result = Runner.run_streamed(agent, f"Question {turn}", context=context, run_config=config)
+            async for _ in result.stream_events():
+                pass
+
+    async def bounded() -> Transcript:
+        transcript = Transcript(maxlen=50, max_chars=500)
+        for turn in range(turns):
+            async for _ in stream_events(
+                agent, f"Question {turn}", ["agent_updated_stream_event", "message_output_item", "tool_call_output_item"],
+                context=context, run_config=config, transcript=transcript,
+            ):
+                pass
+        return transcript
+
+    for label, session in [("keep everything", unbounded), ("keep nothing", discard), ("bounded stream", bounded)]:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        kept = await session()
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<16} {turns} turns in {elapsed:.1f}s, retained {retained / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB")
+        del kept
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
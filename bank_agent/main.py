@@ -1,34 +1,46 @@
 import os
+import sys
 from dotenv import load_dotenv
-from agents import Agent, GuardrailFunctionOutput, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, function_tool, input_guardrail
+from agents import Agent, GuardrailFunctionOutput, AsyncOpenAI, OpenAIChatCompletionsModel, input_guardrail
 from agents.run import RunContextWrapper
 from agents.run import RunConfig
 from pydantic import BaseModel
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.background import run_sync
+from agent_kit.guardrails import early_decision
+from agent_kit.lazy import LazyModel
+from agent_kit.rate_limit import ThrottledModel
+from agent_kit.offload import offloaded_tool
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API Key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI-compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API Key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
+
+    # Retries are left to the shared rate-limit scheduler so it sees every 429.
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        max_retries=0
+    )
 
-# Set up the model (Gemini-2.0-Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    # Set up the model (Gemini-2.0-Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+# Throttled by the process-wide scheduler.
+model = ThrottledModel(LazyModel(build_model))
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -47,11 +59,13 @@ guardrail_agent = Agent(
 
 @input_guardrail
 async def check_bank_related(ctx: RunContextWrapper[None], agent: Agent, input: str) -> GuardrailFunctionOutput:
-
-    result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+    # Decide as soon as is_bank_related is streamed.
+    is_bank_related, _ = await early_decision(
+        guardrail_agent, input, "is_bank_related", context=ctx.context, run_config=config, lane="guardrail"
+    )
     return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=not result.final_output.is_bank_related
+        output_info={"is_bank_related": is_bank_related},
+        tripwire_triggered=not is_bank_related
     )
 
 def check_user(ctx: RunContextWrapper[Account], agent: Agent) -> bool:
@@ -61,7 +75,8 @@ def check_user(ctx: RunContextWrapper[Account], agent: Agent) -> bool:
         print("User authentication failed.")
         return False
 
-@function_tool(is_enabled=check_user)
+# Balance lookup, offered only once the user is authenticated.
+@offloaded_tool(is_enabled=check_user)
 def check_balance(account_number: str) -> str:
     print("User is authenticated.")
     print(f"Checking balance for account number: {account_number}")
@@ -74,13 +89,18 @@ bank_agent = Agent(
     input_guardrails=[check_bank_related]
 )
 
-user_context = Account(name="Alishba", pin=1234)
+def main():
+    user_context = Account(name="Alishba", pin=1234)
 
-result = Runner.run_sync(
-    bank_agent,
-    "I want to check my balance. My account number is 309473804",
-    context=user_context,
-    run_config=config
-)
+    # Runs on agent_kit's shared background loop, so the model client is reused.
+    result = run_sync(
+        bank_agent,
+        "I want to check my balance. My account number is 309473804",
+        context=user_context,
+        run_config=config
+    )
+
+    print(result.final_output)
 
-print(result.final_output)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
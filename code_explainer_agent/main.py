@@ -1,28 +1,36 @@
 import os
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+import sys
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
 from dotenv import load_dotenv
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.background import run_sync
+from agent_kit.lazy import LazyModel
 
 load_dotenv()
-gemini_api_key = os.getenv("GEMINI_API_KEY")
 
-# Check if the API key is present; if not, raise an error
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
+# Gemini through its OpenAI-compatible endpoint.
+def build_model() -> OpenAIChatCompletionsModel:
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
 
-#Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+    # Check if the API key is present; if not, raise an error
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    #Reference: https://ai.google.dev/gemini-api/docs/openai
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+    )
+
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+model = LazyModel(build_model)
 
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -31,22 +39,26 @@ code_explainer_agent = Agent(
     instructions="You are a Python tutor. Your job is to explain any given Python code line by line in simple English so that beginners can easily understand it.",
 )
 
-#  Multiline input from terminal
-print("Enter your Python code to explain (type 'END' on a new line to finish):")
-lines = []
-while True:
-    line = input()
-    if line.strip().upper() == "END":
-        break
-    lines.append(line)
+def main():
+    #  Multiline input from terminal
+    print("Enter your Python code to explain (type 'END' on a new line to finish):")
+    lines = []
+    while True:
+        line = input()
+        if line.strip().upper() == "END":
+            break
+        lines.append(line)
 
-user_input = "\n".join(lines)
+    user_input = "\n".join(lines)
 
 
-response = Runner.run_sync(
-    code_explainer_agent,
-    input=user_input,
-    run_config=config
-)
+    response = run_sync(
+        code_explainer_agent,
+        input=user_input,
+        run_config=config
+    )
+
+    print(response.final_output)
 
-print(response.final_output)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
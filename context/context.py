@@ -1,34 +1,40 @@
 import os
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunContextWrapper, function_tool
+import sys
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunContextWrapper
 from dotenv import load_dotenv
 from agents.run import RunConfig
 from pydantic import BaseModel
 import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.lazy import LazyModel
+from agent_kit.registry import AgentRegistry, cached_function_tool
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
 
-# Set up the model (Gemini 2.0 Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+    )
+
+    # Set up the model (Gemini 2.0 Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+model = LazyModel(build_model)
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -36,8 +42,8 @@ config = RunConfig(
 class UserId(BaseModel):
     id : int
 
-# A tool function that accesses local context via the wrapper
-@function_tool
+# A tool function that accesses local context via the wrapper (its schema is read from the schema cache)
+@cached_function_tool
 async def check_id(wrapper: RunContextWrapper[UserId]) -> str:
     """Check the user has valid ID."""
     user = wrapper.context
@@ -46,18 +52,24 @@ async def check_id(wrapper: RunContextWrapper[UserId]) -> str:
     else:
         return "you are not allowed"
     
-# Define the Simple Agent.
-async def main():
-    # Create your context object
-    user_context = UserId(id=123)
+registry = AgentRegistry()
 
-    agent = Agent(
+# Define the Simple Agent.
+@registry.define("Friendly Assistant")
+def friendly_assistant() -> Agent:
+    return Agent(
         name="Friendly Assistant",
         instructions= "You are a helpful, friendly assistant who answers questions clearly and politely.",
         model=model,
         tools=[check_id]
     )
-    
+
+async def main():
+    # Create your context object
+    user_context = UserId(id=123)
+
+    agent = registry.get("Friendly Assistant")
+
     # Get User input and Run the Agent.
 
     user_query = input("Enter your query here: ")
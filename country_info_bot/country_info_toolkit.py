@@ -1,33 +1,40 @@
 import os
+import sys
 from dotenv import load_dotenv
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
 from agents.run import RunConfig
 import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.cassette import cassette_from_env
+from agent_kit.lazy import LazyModel
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API Key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI-compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API Key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
 
-# Set up the model (Gemini-2.0-Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+    )
+
+    # Set up the model (Gemini-2.0-Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+# Set AGENT_KIT_CASSETTE to record or replay model traffic (see agent_kit.cassette).
+model = cassette_from_env(LazyModel(build_model))
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
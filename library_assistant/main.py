@@ -1,34 +1,48 @@
 import os
+import sys
 from dotenv import load_dotenv
-from agents import Agent, GuardrailFunctionOutput, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, function_tool, input_guardrail, InputGuardrailTripwireTriggered, ModelSettings
+from agents import Agent, GuardrailFunctionOutput, AsyncOpenAI, OpenAIChatCompletionsModel, input_guardrail, InputGuardrailTripwireTriggered, ModelSettings
 from agents.run import RunContextWrapper
 from agents.run import RunConfig
 from pydantic import BaseModel
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.background import run_batch
+from agent_kit.composite import format_locally, related_composites
+from agent_kit.guardrails import early_decision
+from agent_kit.lazy import LazyModel
+from agent_kit.rate_limit import ThrottledModel
+from agent_kit.prompts import CompiledInstructions
+from agent_kit.memo import invalidates, pure_tool
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API Key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI-compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API Key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
+
+    # Retries are left to the shared rate-limit scheduler so it sees every 429.
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        max_retries=0
+    )
 
-# Set up the model (Gemini-2.0-Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    # Set up the model (Gemini-2.0-Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+# Throttled by the process-wide scheduler.
+model = ThrottledModel(LazyModel(build_model))
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -47,10 +61,12 @@ guardrail_agent = Agent(
 
 @input_guardrail
 async def check_library_related(ctx: RunContextWrapper[None], agent: Agent, input: str) -> GuardrailFunctionOutput:
-    result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+    is_library_related, _ = await early_decision(
+        guardrail_agent, input, "is_library_related", context=ctx.context, run_config=config, lane="guardrail"
+    )
     return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=not result.final_output.is_library_related
+        output_info={"is_library_related": is_library_related},
+        tripwire_triggered=not is_library_related
     )
 
 def is_valid_member(ctx: RunContextWrapper[User], agent: Agent) -> bool:
@@ -62,7 +78,13 @@ book_db = {
     "AI Revolution": 0,
 }
 
-@function_tool
+# Every change to book_db must go through here so cached tool results are dropped.
+@invalidates("book_db")
+def set_copies(book_name: str, copies: int) -> None:
+    book_db[book_name] = copies
+
+# Cache hits are answered on the loop; misses read book_db in a worker thread.
+@pure_tool(depends_on=("book_db",))
 def search_book(book_name: str) -> str:
     """
     Use this tool when user asks 'Do you have ...' or 'Is ... available?'
@@ -72,7 +94,7 @@ def search_book(book_name: str) -> str:
     else:
         return f"'{book_name}' is not available in the library."
 
-@function_tool(is_enabled=is_valid_member)
+@pure_tool(depends_on=("book_db",), is_enabled=is_valid_member)
 def check_availability(book_name: str) -> str:
     """
     Use this tool when user asks 'How many copies' or 'Check availability'.
@@ -83,48 +105,70 @@ def check_availability(book_name: str) -> str:
     else:
         return f"'{book_name}' is not found in the library records."
 
-@function_tool
+@pure_tool
 def library_timings() -> str:
     """
     Returns the library opening and closing time
     """
     return "The library is open from 9 AM to 6 PM, Monday to Saturday."
 
-def dynamic_instruction(ctx: RunContextWrapper[User], agent: Agent) -> str:
-    return f"""
-    You are a helpful library assistant. Address the user by their name: {ctx.context.name}.
-
-    - If the user asks 'Do you have ...' or 'Is ... available?', use the search_book tool.
-    - If the user asks 'How many copies...' or 'Check availability', use the check_availability tool.
-    - If the user asks about library hours, use the library_timings tool.
-    - If the user asks a query that combines checking if a book exists and its availability (e.g., 'Do you have ... and how many copies?'), use both search_book and check_availability tools and combine their outputs.
-    """
+# search_book + check_availability in one call: search_book_and_check_availability.
+composite_tools = related_composites(search_book, check_availability)
+
+# Static instructions come first and never change, so the provider can cache that prefix;
+# the user's name goes in a short section at the end.
+library_instructions = CompiledInstructions(
+    blocks=[
+        "You are a helpful library assistant. Address the user by the name given in the 'Current user' section.",
+        """
+        - If the user asks 'Do you have ...' or 'Is ... available?', use the search_book tool.
+        - If the user asks 'How many copies...' or 'Check availability', use the check_availability tool.
+        - If the user asks about library hours, use the library_timings tool.
+        - If the user asks a query that combines checking if a book exists and its availability (e.g., 'Do you have ... and how many copies?'), use the search_book_and_check_availability tool.
+        - When a question has several independent parts, call all the tools you need at once.
+        """,
+    ],
+    user_fields=lambda ctx: {"Name": ctx.context.name},
+)
 
 library_agent = Agent[User](
     name="Library Agent",
-    instructions=dynamic_instruction,
-    tools=[search_book, check_availability, library_timings],
+    instructions=library_instructions,
+    tools=[search_book, check_availability, library_timings, *composite_tools],
     input_guardrails=[check_library_related],
     model_settings=ModelSettings(
         temperature=0.2,
         tool_choice='auto', 
-        parallel_tool_calls=None,
+        parallel_tool_calls=True,
     ),
-    tool_use_behavior='run_llm_again'
+    # The lookup tools already answer in full sentences, so their outputs are returned
+    # directly; the model is only asked again when one of them fails.
+    tool_use_behavior=format_locally(
+        {tool.name for tool in [search_book, check_availability, library_timings, *composite_tools]},
+        formatter=lambda ctx, outputs: f"Hi {ctx.context.name}!\n" + "\n".join(outputs),
+    )
 )
 
-user_context = User(name="Alishba", member_id=1001)
-
-queries = [
-    "Do you have Atomic Habits and how many copies are available?",
-    "Is The Great Gatsby available and what are the library hours?",
-    "Tell me about Python programming.",  # Non-library query
-]
-
-for q in queries:
-    print("\n--- User Query:", q)
-    try:
-        result = Runner.run_sync(library_agent, q, context=user_context, run_config=config)
-        print("Assistant:", result.final_output)
-    except InputGuardrailTripwireTriggered:
-        print(" Guardrail triggered! The query is not related to library services.")
\ No newline at end of file
+def main():
+    user_context = User(name="Alishba", member_id=1001)
+
+    queries = [
+        "Do you have Atomic Habits and how many copies are available?",
+        "Is The Great Gatsby available and what are the library hours?",
+        "Tell me about Python programming.",  # Non-library query
+    ]
+
+    # All queries run at once on agent_kit's shared background loop and one model client.
+    results = run_batch(library_agent, queries, return_exceptions=True, context=user_context, run_config=config)
+
+    for q, result in zip(queries, results):
+        print("\n--- User Query:", q)
+        if isinstance(result, InputGuardrailTripwireTriggered):
+            print(" Guardrail triggered! The query is not related to library services.")
+        elif isinstance(result, Exception):
+            raise result
+        else:
+            print("Assistant:", result.final_output)
+
+if __name__ == "__main__":
+    main()
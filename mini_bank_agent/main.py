@@ -1,45 +1,52 @@
 from agents import( 
 Agent,
-GuardrailFunctionOutput,
 InputGuardrailTripwireTriggered,
 OutputGuardrailTripwireTriggered,
 Runner,
 AsyncOpenAI,
 OpenAIChatCompletionsModel,
-function_tool,
-input_guardrail,
-output_guardrail,
 )
 import os
+import sys
 from pydantic import BaseModel
 from agents.run import RunContextWrapper, RunConfig
 from dotenv import load_dotenv
 import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.rate_limit import ThrottledModel
+from agent_kit.guardrails import GuardrailEngine
+from agent_kit.lazy import LazyModel
+from agent_kit.offload import offloaded_tool
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API Key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI-compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API Key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
+
+    # Retries are left to the shared rate-limit scheduler so it sees every 429.
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        max_retries=0
+    )
 
-# Set up the model (Gemini-2.0-Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    # Set up the model (Gemini-2.0-Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+# Throttled by the process-wide scheduler.
+model = ThrottledModel(LazyModel(build_model))
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -47,39 +54,12 @@ class Account(BaseModel):
     name: str
     pin: int
 
-class GuardrailOutput(BaseModel):
-    is_bank_related: bool
-    reasoning: str
-
-input_guardrail_agent = Agent(
-    name="Input Guardrail Agent",
-    instructions="check if the user is asking you bank related queries. Return a structured output with 'is_bank_related' as a boolean and 'reasoning' explaining your decision.",
-    output_type=GuardrailOutput,
-)
+# One engine checks the bank policy for a text in a single call, in the guardrail lane.
+guardrails = GuardrailEngine(config, lane="guardrail")
+guardrails.register("is_bank_related", "true if the text is a bank related query or contains bank-related content")
 
-output_guardrail_agent = Agent(
-    name="Output Guardrail Agent",
-    instructions="Check if the output includes any bank-related content. Return a structured output with 'is_bank_related' as a boolean and 'reasoning' explaining your decision.",
-    output_type=GuardrailOutput,
-)
-
-@input_guardrail
-async def check_bank_related_input(ctx: RunContextWrapper[None], agent: Agent, input: str) -> GuardrailFunctionOutput:
-
-    result = await Runner.run(input_guardrail_agent, input, context=ctx.context, run_config=config)
-    return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=not result.final_output.is_bank_related,
-    )
-
-@output_guardrail
-async def check_bank_related_output(ctx: RunContextWrapper[None], agent: Agent, output: str)->GuardrailFunctionOutput:
-    
-    result = await Runner.run(output_guardrail_agent, output, context=ctx.context, run_config = config)
-    return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=not result.final_output.is_bank_related,
-    )
+check_bank_related_input = guardrails.input_guardrail("is_bank_related")
+check_bank_related_output = guardrails.output_guardrail("is_bank_related")
 
 def check_user(ctx: RunContextWrapper[Account], agent: Agent) -> bool:
     if ctx.context.name == "Alishba" and ctx.context.pin == 1234:
@@ -88,7 +68,8 @@ def check_user(ctx: RunContextWrapper[Account], agent: Agent) -> bool:
         print("⚠️ Access denied. Incorrect credentials.")
         return False
 
-@function_tool(is_enabled=check_user)
+# Reads from a small in-memory account table.
+@offloaded_tool(is_enabled=check_user)
 def check_balance(account_number: str) -> str:
     accounts = {
         "309473804": "$1,000,000",
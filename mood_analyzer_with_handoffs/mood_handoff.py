@@ -1,39 +1,48 @@
 import os
+import sys
 from dotenv import load_dotenv
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
 from agents.run import RunConfig
 import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.lazy import LazyModel
+from agent_kit.registry import AgentRegistry
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI-compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
 
-# Set up the model (Gemini-2.0-Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+    )
+
+    # Set up the model (Gemini-2.0-Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+model = LazyModel(build_model)
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
-async def main():
-    # Agent 1: Mood Analyzer
-    mood_agent = Agent(
+registry = AgentRegistry()
+
+# Agent 1: Mood Analyzer
+@registry.define("Mood Analyzer")
+def mood_analyzer() -> Agent:
+    return Agent(
         name="Mood Analyzer",
         instructions="""
         Analyze the user's message and return ONLY one word:
@@ -49,8 +58,10 @@ async def main():
         model=model
     )
 
-    # Agent 2: Activity Suggester (only for sad/stressed/neutral)
-    activity_agent = Agent(
+# Agent 2: Activity Suggester (only for sad/stressed/neutral)
+@registry.define("Activity Suggester")
+def activity_suggester() -> Agent:
+    return Agent(
         name="Activity Suggester",
         instructions="""
         Suggest a compassionate activity based on WHY the user is sad/stressed/neutral. 
@@ -64,6 +75,10 @@ async def main():
         model=model
     )
 
+async def main():
+    mood_agent = registry.get("Mood Analyzer")
+    activity_agent = registry.get("Activity Suggester")
+
     # Get User input.
     user_query = input("How are you feeling today? ")
 
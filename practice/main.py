@@ -1,34 +1,46 @@
 import os
-from agents import Agent, GuardrailFunctionOutput, InputGuardrailTripwireTriggered, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunContextWrapper, TResponseInputItem, function_tool, input_guardrail
+import sys
+from agents import Agent, GuardrailFunctionOutput, InputGuardrailTripwireTriggered, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunContextWrapper, TResponseInputItem, input_guardrail
 from dotenv import load_dotenv
 from agents.run import RunConfig
 from pydantic import BaseModel
 import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.guardrails import early_decision
+from agent_kit.lazy import LazyModel
+from agent_kit.rate_limit import ThrottledModel
+from agent_kit.memo import pure_tool
+from agent_kit.registry import AgentRegistry, get_schema_cache
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
+
+    # Retries are left to the shared rate-limit scheduler so it sees every 429.
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        max_retries=0
+    )
 
-# Set up the model (Gemini 2.0 Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    # Set up the model (Gemini 2.0 Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+# Throttled by the process-wide scheduler.
+model = ThrottledModel(LazyModel(build_model))
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -41,26 +53,34 @@ class MathHomeworkOutput(BaseModel):
     is_math_homework: bool
     reasoning: str
 
-guardrail_agent = Agent( 
-    name="Guardrail check",
-    instructions="Check if the user is asking you to do their math homework.",
-    output_type=MathHomeworkOutput,
-)
+# The guardrail's output schema comes from the on-disk schema cache.
+registry = AgentRegistry(schema_cache=get_schema_cache())
+
+@registry.define("Guardrail check")
+def guardrail_agent() -> Agent:
+    return Agent( 
+        name="Guardrail check",
+        instructions="Check if the user is asking you to do their math homework.",
+        output_type=MathHomeworkOutput,
+    )
 
 @input_guardrail
 async def math_guardrail( 
     ctx: RunContextWrapper[UserInfo], agent: Agent, input: str | list[TResponseInputItem]
 ) -> GuardrailFunctionOutput:
-    result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+    # Decide as soon as is_math_homework is streamed; the reasoning finishes in the background.
+    is_math_homework, _ = await early_decision(
+        registry.get("Guardrail check"), input, "is_math_homework", context=ctx.context, run_config=config, lane="guardrail"
+    )
 
     return GuardrailFunctionOutput(
-        output_info=result.final_output, 
-        tripwire_triggered=result.final_output.is_math_homework
+        output_info={"is_math_homework": is_math_homework},
+        tripwire_triggered=is_math_homework
     )
 
 
-# Tool to give feedback based on score
-@function_tool
+# Tool to give feedback based on score (cached per name and score)
+@pure_tool(context_fields=("name", "score"), schema_cache=True)
 async def give_feedback(wrapper: RunContextWrapper[UserInfo]) -> str:
     """Returns feedback based on the user's score from context."""
     user = wrapper.context
@@ -71,21 +91,24 @@ async def give_feedback(wrapper: RunContextWrapper[UserInfo]) -> str:
     else:
         return f"{user.name}, keep practicing, you scored {user.score}."
 
-# Main function
-async def main():
-    # Create context
-    user_context = UserInfo(name="Alishba", score=95)
-
-    # Define agent
-    agent = Agent(
+# Define agent
+@registry.define("Feedback Agent")
+def feedback_agent() -> Agent:
+    return Agent(
         name="Feedback Agent",
         instructions="You give feedback based on the user's score.",
         model=model,
         tools=[give_feedback],
         input_guardrails=[math_guardrail]
-        
     )
 
+# Main function
+async def main():
+    # Create context
+    user_context = UserInfo(name="Alishba", score=95)
+
+    agent = registry.get("Feedback Agent")
+
     # Get user input
     user_query = input("Enter your query (e.g., 'How did I do?'): ")
 
@@ -1,39 +1,49 @@
 import os
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+import sys
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel
 from dotenv import load_dotenv
 from agents.run import RunConfig
 import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.run_cache import cached_run
+from agent_kit.lazy import LazyModel
+from agent_kit.registry import AgentRegistry
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
 
-# Set up the model (Gemini 2.0 Flash).
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+    )
+
+    # Set up the model (Gemini 2.0 Flash).
+    return OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
+
+model = LazyModel(build_model)
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
+registry = AgentRegistry()
+
 # Define the Product Suggester Agent.
-async def main():
-    agent = Agent(
+@registry.define("Smart Store Assistant")
+def product_suggester() -> Agent:
+    return Agent(
         name="Smart Store Assistant",
         instructions="""
         You are a helpful product recommendation agent for a pharmacy/store.
@@ -46,11 +56,14 @@ async def main():
         """,
         model=model
     )
-    
-    # Get User input and Run the Agent.
+
+async def main():
+    agent = registry.get("Smart Store Assistant")
+
+    # Get User input and Run the Agent (repeated questions are answered from the run cache).
     user_query = input("What do you need help with? (e.g: 'I have a headache'): ")
 
-    result = await Runner.run(
+    result = await cached_run(
     agent,
     user_query,
     run_config=config
@@ -1,34 +1,49 @@
 import os
+import sys
 from dotenv import load_dotenv
 from typing import Literal
-from agents import Agent, ItemHelpers, ModelSettings, Runner, AsyncOpenAI, RunConfig, OpenAIChatCompletionsModel, RunContextWrapper, function_tool, output_guardrail, GuardrailFunctionOutput
+from agents import Agent, ItemHelpers, ModelSettings, AsyncOpenAI, RunConfig, OpenAIChatCompletionsModel, RunContextWrapper, output_guardrail, GuardrailFunctionOutput
 import asyncio
 from pydantic import BaseModel
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from agent_kit.cassette import cassette_from_env
+from agent_kit.guardrails import early_decision
+from agent_kit.lazy import LazyModel
+from agent_kit.rate_limit import ThrottledModel
+from agent_kit.offload import offloaded_tool
+from agent_kit.sessions import Session, SessionManager
+from agent_kit.streaming import Transcript, stream_events
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API Key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
 # Configure Gemini via OpenAI-compatible API.
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Gemini API Key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
+
+    # Retries are left to the shared rate-limit scheduler so it sees every 429.
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        max_retries=0
+    )
 
-# Set up the model (Gemini-1.5-Flash-Latest).
-model = OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash-latest",
-    openai_client=external_client
-)
+    # Set up the model (Gemini-1.5-Flash-Latest).
+    return OpenAIChatCompletionsModel(
+        model="gemini-1.5-flash-latest",
+        openai_client=external_client
+    )
+
+# Throttled by the process-wide scheduler. A recorded support conversation can be
+# replayed offline via AGENT_KIT_CASSETTE, without going through the scheduler.
+model = cassette_from_env(ThrottledModel(LazyModel(build_model)))
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -52,17 +67,20 @@ guardrail_agent = Agent(
 
 @output_guardrail
 async def no_apologies_guardrail(wrapper: RunContextWrapper[None], agent: Agent, output: str) -> GuardrailFunctionOutput:
-    
-    result = await Runner.run(guardrail_agent, output, context=wrapper.context, run_config=config)
+    # The verdict is streamed; the guardrail returns once has_apology is parsed.
+    has_apology, _ = await early_decision(
+        guardrail_agent, output, "has_apology", context=wrapper.context, run_config=config, lane="guardrail"
+    )
     return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=not result.final_output.has_apology,
+        output_info={"has_apology": has_apology},
+        tripwire_triggered=not has_apology,
     )
 
 def is_premium(ctx: RunContextWrapper[UserInfo], agent: Agent) -> bool:
     return ctx.context.is_premium_user
 
-@function_tool(is_enabled=is_premium)
+# Refunds are only for premium users.
+@offloaded_tool(is_enabled=is_premium)
 def issue_refund(amount: int, reason: str):
     """Issues a refund to a premium user."""
     return f"Refund of ${amount} for '{reason}' has been processed."
@@ -70,7 +88,7 @@ def issue_refund(amount: int, reason: str):
 def is_technical(ctx: RunContextWrapper[UserInfo], agent: Agent) -> bool:
     return ctx.context.issue_type == "technical"
 
-@function_tool(is_enabled=is_technical)
+@offloaded_tool(is_enabled=is_technical)
 def restart_service(service_name: str):
     """Restarts a technical service."""
     return f"The '{service_name}' service has been restarted."
@@ -98,8 +116,53 @@ triage_agent = Agent[UserInfo](
     output_guardrails=[no_apologies_guardrail] 
 )
 
+# Simple keyword routing
+def route_issue(user_input: str) -> str:
+    if "refund" in user_input.lower():
+        return "billing"
+    elif "restart" in user_input.lower():
+        return "technical"
+    else:
+        return "general"
+
+# Handle one message for one customer; each session has its own UserInfo.
+async def handle_turn(session: Session, user_input: str) -> None:
+    session.context.issue_type = route_issue(user_input)
+
+    # Only the events printed below are delivered; raw text deltas are dropped at the model
+    # and the session keeps a bounded transcript instead of whole results.
+    if session.state is None:
+        session.state = {"transcript": Transcript(maxlen=50)}
+
+    async for event in stream_events(
+        triage_agent,
+        user_input,
+        ["agent_updated_stream_event", "tool_call_output_item", "message_output_item"],
+        context=session.context,
+        run_config=config,
+        transcript=session.state["transcript"],
+    ):
+        if event.type == "agent_updated_stream_event":
+            # Sirf Triage → Specialist handoff print karo
+            if event.new_agent.name != "Triage Agent":
+                print(f"[Handoff] Switching from Triage Agent → {event.new_agent.name}")
+            continue
+
+        elif event.type == "run_item_stream_event":
+            if event.item.type == "tool_call_output_item":
+                print(f"[Tool Output] {event.item.output}")
+                
+            elif event.item.type == "message_output_item":
+                print(f"[Response]\n{ItemHelpers.text_message_output(event.item)}")
+            else:
+                pass
+
+sessions = SessionManager(
+    handle_turn,
+    context_factory=lambda session_id: UserInfo(name="Alishba", is_premium_user=True, issue_type="billing"),
+)
+
 async def main():
-    user_context = UserInfo(name="Alishba", is_premium_user=True, issue_type="billing")
     print("Welcome to the Console-Based Support Agent System. How can I help you today?")
 
     while True:
@@ -107,37 +170,9 @@ async def main():
         if user_input.lower() in ["exit", "quit"]:
             break
 
-        # Simple keyword routing
-        if "refund" in user_input.lower():
-            user_context.issue_type = "billing"
-        elif "restart" in user_input.lower():
-            user_context.issue_type = "technical"
-        else:
-            user_context.issue_type = "general"
-
-        result = Runner.run_streamed(triage_agent, user_input, context=user_context, run_config=config)
-
-        async for event in result.stream_events():
-            if event.type == "raw_response_event":
-                continue
-
-            elif event.type == "agent_updated_stream_event":
-                # Sirf Triage → Specialist handoff print karo
-                if event.new_agent.name != "Triage Agent":
-                    print(f"[Handoff] Switching from Triage Agent → {event.new_agent.name}")
-                continue
-
-            elif event.type == "run_item_stream_event":
-                if event.item.type == "tool_call_item":
-                    continue
-                    
-                elif event.item.type == "tool_call_output_item":
-                    print(f"[Tool Output] {event.item.output}")
-                    
-                elif event.item.type == "message_output_item":
-                    print(f"[Response]\n{ItemHelpers.text_message_output(event.item)}")
-                else:
-                    pass
+        await sessions.submit("console", user_input)
+
+    await sessions.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+import asyncio
+import gc
+import threading
+
+from agent_kit.background import BackgroundLoop
+
+
+def test_a_failure_after_the_caller_cancels_is_retrieved():
+    background = BackgroundLoop()
+    unretrieved = []
+    background.loop.call_soon_threadsafe(
+        background.loop.set_exception_handler, lambda loop, context: unretrieved.append(context["message"])
+    )
+    started = threading.Event()
+
+    async def fails_when_cancelled():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            raise RuntimeError("cleanup failed")
+
+    future = background.submit(fails_when_cancelled())
+    started.wait(5)
+    future.cancel()
+    # Let the loop cancel the task and run its done callbacks, then collect it.
+    background.call(asyncio.sleep(0.05))
+    del future
+    gc.collect()
+    background.close()
+    assert unretrieved == []
+
+
+def test_cancelling_the_future_cancels_the_run():
+    background = BackgroundLoop()
+    started, cancelled = threading.Event(), threading.Event()
+
+    async def waits():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    future = background.submit(waits())
+    started.wait(5)
+    assert future.cancel()
+    assert cancelled.wait(5)
+    background.close()
@@ -0,0 +1,41 @@
+import asyncio
+
+from agents import RunContextWrapper, function_tool
+from agents.agent import ToolsToFinalOutputResult
+from agents.tool import FunctionToolResult
+
+from agent_kit.composite import composite_tool, format_locally
+
+
+@function_tool
+def search(book_name: str) -> str:
+    """Search for a book."""
+    return f"Found {book_name}."
+
+
+@function_tool
+def count(book_name: str) -> str:
+    """Count copies of a book."""
+    if book_name == "missing":
+        raise KeyError(book_name)
+    return f"3 copies of {book_name}."
+
+
+def test_composite_reports_malformed_arguments_to_the_model():
+    tool = composite_tool(search, count)
+    output = asyncio.run(tool.on_invoke_tool(RunContextWrapper(context=None), "{not json"))
+    assert output.startswith("An error occurred while running the tool.")
+    assert "Invalid JSON input for tool search_and_count" in output
+
+
+def test_format_locally_asks_the_model_again_after_a_failure():
+    tool = composite_tool(search, count)
+    ctx = RunContextWrapper(context=None)
+    behavior = format_locally({tool.name})
+
+    def decide(book: str) -> ToolsToFinalOutputResult:
+        output = asyncio.run(tool.on_invoke_tool(ctx, f'{{"book_name": "{book}"}}'))
+        return behavior(ctx, [FunctionToolResult(tool=tool, output=output, run_item=None)])
+
+    assert decide("Dune") == ToolsToFinalOutputResult(is_final_output=True, final_output="Found Dune.\n3 copies of Dune.")
+    assert decide("missing").is_final_output is False
@@ -0,0 +1,73 @@
+import asyncio
+
+from agents import Agent, RunConfig
+from pydantic import BaseModel
+
+from agent_kit.guardrails import stream_fields
+from agent_kit.json_stream import IncrementalJSONParser
+from agent_kit.stand_in import StandInModel
+
+
+def _feed_in_pieces(text: str, size: int) -> list[tuple[str, object]]:
+    parser = IncrementalJSONParser()
+    fields = [field for i in range(0, len(text), size) for field in parser.feed(text[i:i + size])]
+    assert parser.done
+    return fields
+
+
+def test_fields_are_reported_once_whatever_the_chunk_boundaries():
+    text = '{"blocked": true, "score": 12, "note": null, "reason": "long text"}'
+    expected = [("blocked", True), ("score", 12), ("note", None), ("reason", "long text")]
+    for size in range(1, len(text) + 1):
+        assert _feed_in_pieces(text, size) == expected
+
+
+def test_escaped_quotes_and_backslashes_do_not_end_a_string():
+    text = r'{"reason": "said \"no\" \\", "a\"b": "c"}'
+    for size in (1, 3, len(text)):
+        assert _feed_in_pieces(text, size) == [("reason", 'said "no" \\'), ('a"b', "c")]
+
+
+def test_nested_values_are_reported_whole():
+    text = '{"tags": ["a", "]}", {"b": [1, 2]}], "meta": {"x": {"y": "}"}}, "last": 1}'
+    for size in (1, 5, len(text)):
+        assert _feed_in_pieces(text, size) == [
+            ("tags", ["a", "]}", {"b": [1, 2]}]),
+            ("meta", {"x": {"y": "}"}}),
+            ("last", 1),
+        ]
+
+
+def test_text_around_the_object_such_as_a_code_fence_is_ignored():
+    text = '```json\n{"allowed": false}\n```'
+    for size in (1, 4, len(text)):
+        assert _feed_in_pieces(text, size) == [("allowed", False)]
+
+
+def test_a_number_waits_for_its_delimiter():
+    parser = IncrementalJSONParser()
+    assert list(parser.feed('{"score": 1')) == []
+    assert list(parser.feed("2")) == []
+    assert list(parser.feed("}")) == [("score", 12)]
+
+
+class Verdict(BaseModel):
+    blocked: bool
+    reason: str
+
+
+def test_stream_fields_validates_early_values_against_the_output_type():
+    # The model quotes the boolean; the raw value "false" would be truthy.
+    model = StandInModel(latency=0, reply=lambda call: '{"blocked": "false", "reason": "fine"}', chunk_size=4)
+    agent = Agent(name="Check", instructions="Check the input.", output_type=Verdict)
+
+    async def run():
+        futures, task = stream_fields(
+            agent, "hello", ("blocked",), run_config=RunConfig(model=model, tracing_disabled=True)
+        )
+        blocked = await futures["blocked"]
+        return blocked, await task
+
+    blocked, final_output = asyncio.run(run())
+    assert blocked is False
+    assert final_output == Verdict(blocked=False, reason="fine")
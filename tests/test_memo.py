@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from agents import RunContextWrapper, function_tool
+
+from agent_kit.memo import invalidate, invalidates, pure_tool
+from agent_kit.offload import offloaded
+
+
+def double(n: int) -> int:
+    """Double a number."""
+    return 2 * n
+
+
+def test_malformed_arguments_are_reported_like_function_tool():
+    memoized = pure_tool(double)
+    plain = function_tool(double)
+    ctx = RunContextWrapper(context=None)
+
+    async def invoke(tool):
+        return await tool.on_invoke_tool(ctx, "{not json")
+
+    memo_output, plain_output = asyncio.run(invoke(memoized)), asyncio.run(invoke(plain))
+    assert memo_output == plain_output
+    assert "Invalid JSON" in memo_output
+
+
+def test_results_are_cached_per_arguments():
+    calls = []
+
+    def record(n: int) -> int:
+        """Record a call."""
+        calls.append(n)
+        return n
+
+    tool = pure_tool(record)
+    ctx = RunContextWrapper(context=None)
+
+    async def invoke_all():
+        return [await tool.on_invoke_tool(ctx, args) for args in ('{"n": 1}', '{"n": 1}', '{"n": 2}')]
+
+    assert asyncio.run(invoke_all()) == [1, 1, 2]
+    assert calls == [1, 2]
+
+
+def test_invalidate_clears_every_tool_with_the_name():
+    db = {"x": 1}
+
+    def read(key: str) -> int:
+        """Read a value."""
+        return db[key]
+
+    first = pure_tool(read, depends_on=("db",))
+    second = pure_tool(read, depends_on=("db",))
+    ctx = RunContextWrapper(context=None)
+
+    async def invoke_both():
+        return [await tool.on_invoke_tool(ctx, '{"key": "x"}') for tool in (first, second)]
+
+    assert asyncio.run(invoke_both()) == [1, 1]
+    db["x"] = 2
+    invalidate("db")
+    assert asyncio.run(invoke_both()) == [2, 2]
+
+
+def test_result_computed_across_an_invalidation_is_not_cached():
+    db = {"x": 5}
+    reading = threading.Event()
+    written = threading.Event()
+
+    def slow_read(key: str) -> int:
+        """Read a value slowly."""
+        value = db[key]
+        reading.set()
+        written.wait(1)
+        return value
+
+    tool = pure_tool(offloaded(slow_read), depends_on=("slow_db",))
+
+    @invalidates("slow_db")
+    def write(value: int) -> None:
+        db["x"] = value
+
+    ctx = RunContextWrapper(context=None)
+
+    async def scenario():
+        in_flight = asyncio.create_task(tool.on_invoke_tool(ctx, '{"key": "x"}'))
+        await asyncio.to_thread(reading.wait, 1)
+        write(4)
+        written.set()
+        return await in_flight, await tool.on_invoke_tool(ctx, '{"key": "x"}')
+
+    assert asyncio.run(scenario()) == (5, 4)
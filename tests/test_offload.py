@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+from agents import RunContextWrapper
+
+from agent_kit.memo import pure_tool
+from agent_kit.offload import offloaded_tool
+
+
+def where(label: str) -> str:
+    """Name the thread the tool runs on."""
+    return threading.current_thread().name
+
+
+def _thread_of(tool) -> str:
+    return asyncio.run(tool.on_invoke_tool(RunContextWrapper(context=None), '{"label": "x"}'))
+
+
+def test_sync_tools_are_offloaded_by_default():
+    assert _thread_of(offloaded_tool(where)).startswith("agent_kit-tool")
+    assert _thread_of(pure_tool(where)).startswith("agent_kit-tool")
+
+
+def test_executor_none_keeps_the_tool_on_the_loop():
+    assert _thread_of(offloaded_tool(where, executor=None)) == "MainThread"
+    assert _thread_of(pure_tool(where, executor=None)) == "MainThread"
+
+
+def test_watch_instruments_a_copy_and_never_wraps_twice():
+    from agents import Agent
+
+    from agent_kit.offload import BlockingDetector
+
+    tool = offloaded_tool(where)
+    billing = Agent(name="Billing", tools=[tool])
+    triage = Agent(name="Triage", tools=[tool], handoffs=[billing])
+    billing.handoffs = [triage]
+    clone = triage.clone()
+
+    first = BlockingDetector().watch(clone)
+    second = BlockingDetector().watch(clone)
+    assert triage.tools[0] is tool and clone.tools[0] is tool and billing.tools[0] is tool
+    assert first.tools[0].on_invoke_tool.__wrapped__ is tool.on_invoke_tool
+    assert second.tools[0].on_invoke_tool.__wrapped__ is tool.on_invoke_tool
+    watched = BlockingDetector().watch(triage)
+    assert watched.handoffs[0].handoffs[0] is watched
+    assert triage.handoffs[0] is billing
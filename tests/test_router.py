@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+from agents import ModelSettings, ModelTracing
+
+from agent_kit.router import LatencyRouterModel
+from agent_kit.stand_in import StandInModel
+
+ARGS = ("Be brief.", "hi", ModelSettings(), [], None, [])
+KWARGS = {"tracing": ModelTracing.DISABLED, "previous_response_id": None}
+
+
+def test_a_backup_tried_by_a_failed_hedge_is_not_asked_again():
+    providers = {
+        "primary": StandInModel("primary", latency=0.05, error_rate=1.0),
+        "backup": StandInModel("backup", latency=0.01, error_rate=1.0),
+        "last": StandInModel("last", latency=0.01),
+    }
+    router = LatencyRouterModel(providers, hedge=True, hedge_min_delay=0.01, explore_ratio=0)
+    # Give every route a latency sample so the ranking is fixed and the primary is hedged.
+    for name, latency in [("primary", 0.01), ("backup", 0.02), ("last", 0.03)]:
+        router.stats[name].record_success(latency)
+
+    asyncio.run(router.get_response(*ARGS, **KWARGS))
+    assert [provider.calls for provider in providers.values()] == [1, 1, 1]
+
+
+def test_stream_latency_excludes_the_consumer():
+    router = LatencyRouterModel({"only": StandInModel("only", latency=0.01, chunk_size=1)})
+
+    async def consume_slowly() -> float:
+        start = time.monotonic()
+        async for _ in router.stream_response(*ARGS, **KWARGS):
+            await asyncio.sleep(0.02)
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(consume_slowly())
+    assert router.stats["only"].latencies[0] < elapsed / 2
@@ -0,0 +1,28 @@
+import asyncio
+
+from agents import Agent, ModelSettings, RunConfig
+
+from agent_kit.run_cache import RunCache
+
+
+def _key(cache: RunCache, agent: Agent) -> str:
+    return asyncio.run(cache.key(agent, "Where is my refund?", None, RunConfig(model="gpt-4o")))
+
+
+def test_key_changes_with_handoff_and_agent_tool_targets(tmp_path):
+    cache = RunCache(str(tmp_path / "runs.sqlite3"))
+
+    def build(billing_instructions: str, lookup_settings: ModelSettings) -> Agent:
+        billing = Agent(name="Billing", instructions=billing_instructions)
+        lookup = Agent(name="Lookup", instructions="Look up orders.", model_settings=lookup_settings)
+        return Agent(
+            name="Triage",
+            instructions="Route the customer.",
+            handoffs=[billing],
+            tools=[lookup.as_tool(tool_name="lookup", tool_description="Look up an order.")],
+        )
+
+    base = _key(cache, build("Handle billing.", ModelSettings()))
+    assert _key(cache, build("Handle billing.", ModelSettings())) == base
+    assert _key(cache, build("Handle billing politely.", ModelSettings())) != base
+    assert _key(cache, build("Handle billing.", ModelSettings(temperature=0.1))) != base
@@ -0,0 +1,15 @@
+import pytest
+from starlette.testclient import TestClient
+
+from agent_kit.serve import create_app
+
+
+@pytest.mark.parametrize("body", ["[]", '"x"', "1", "{}", '{"input": "hi", "context": {"pin": "no"}}', "{not json"])
+@pytest.mark.parametrize("path", ["/run", "/stream"])
+def test_malformed_bodies_are_rejected_with_400(monkeypatch, path, body):
+    # Startup builds the model client; no request here reaches the model.
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    with TestClient(create_app("bank")) as client:
+        response = client.post(path, content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 400
+    assert response.json()["error"] == "bad_request"
@@ -0,0 +1,46 @@
+import asyncio
+
+from agent_kit.sessions import SessionManager
+
+
+async def _slow_echo(session, message):
+    await asyncio.sleep(0.05)
+    return message
+
+
+def test_eviction_spares_sessions_with_a_message_in_progress():
+    async def scenario():
+        manager = SessionManager(_slow_echo, lambda session_id: None, max_sessions=1)
+        first = asyncio.create_task(manager.submit("A", "a"))
+        await asyncio.sleep(0.01)  # A's handler is now running with an empty inbox.
+        second = await asyncio.wait_for(manager.submit("B", "b"), 1)
+        result = await asyncio.wait_for(first, 1)
+        await manager.close()
+        return result, second, manager.evicted
+
+    assert asyncio.run(scenario()) == ("a", "b", 0)
+
+
+def test_idle_session_is_evicted_but_not_the_new_one():
+    async def scenario():
+        manager = SessionManager(_slow_echo, lambda session_id: None, max_sessions=1)
+        await manager.submit("A", "a")
+        result = await asyncio.wait_for(manager.submit("B", "b"), 1)
+        sessions = list(manager.sessions)
+        await manager.close()
+        return result, sessions, manager.evicted
+
+    assert asyncio.run(scenario()) == ("b", ["B"], 1)
+
+
+def test_close_cancels_pending_submits():
+    async def scenario():
+        manager = SessionManager(_slow_echo, lambda session_id: None)
+        running = asyncio.create_task(manager.submit("A", "a"))
+        queued = asyncio.create_task(manager.submit("A", "b"))
+        await asyncio.sleep(0.01)
+        await manager.close()
+        await asyncio.wait_for(asyncio.gather(running, queued, return_exceptions=True), 1)
+        return running.cancelled(), queued.cancelled()
+
+    assert asyncio.run(scenario()) == (True, True)
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from agents import Agent, RunConfig
+
+from agent_kit.stand_in import StandInModel
+from agent_kit.streaming import stream_events
+
+agent = Agent(name="Assistant", instructions="Answer briefly.")
+
+
+async def _event_types(run_config: RunConfig) -> list[str]:
+    return [
+        event.data.type if event.type == "raw_response_event" else event.item.type
+        async for event in stream_events(agent, "hi", ["message_output_item"], run_config=run_config)
+    ]
+
+
+def test_only_consumed_events_are_yielded():
+    model = StandInModel(latency=0, reply=lambda call: "a long answer " * 20, chunk_size=4)
+    assert asyncio.run(_event_types(RunConfig(model=model, tracing_disabled=True))) == ["message_output_item"]
+
+
+@pytest.mark.parametrize("model", [None, "gpt-4o"])
+def test_a_model_that_cannot_be_wrapped_is_rejected(model):
+    with pytest.raises(ValueError, match="Model instance"):
+        asyncio.run(_event_types(RunConfig(model=model, tracing_disabled=True)))
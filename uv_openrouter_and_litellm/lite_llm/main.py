@@ -1,22 +1,31 @@
 import os
-from agents import Agent, Runner
-from agents.extensions.models.litellm_model import LitellmModel
+import sys
+from agents import Agent
 from dotenv import load_dotenv
 from agents.run import RunConfig
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from agent_kit.background import run_sync
+from agent_kit.lazy import LazyModel
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Gemini API key.
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
+# LiteLLM is slow to import, so it is only loaded when the model is first used.
+def build_model():
+    from agents.extensions.models.litellm_model import LitellmModel
 
-# Set up the model (Gemini 2.0 Flash).
-model = LitellmModel(
-    model="gemini/gemini-2.0-flash",
-    api_key=gemini_api_key
-)
+    # Fetch Gemini API key.
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file!")
+
+    # Set up the model (Gemini 2.0 Flash).
+    return LitellmModel(
+        model="gemini/gemini-2.0-flash",
+        api_key=gemini_api_key
+    )
+
+model = LazyModel(build_model)
 
 # Disable tracing for simplicity.
 config = RunConfig(
@@ -30,9 +39,13 @@ agent = Agent(
     model=model
 )
 
-result = Runner.run_sync(
-starting_agent=agent,
-input="Hi! Who are you?",
-run_config=config
-)
-print(result.final_output)
\ No newline at end of file
+def main():
+    result = run_sync(
+    starting_agent=agent,
+    input="Hi! Who are you?",
+    run_config=config
+    )
+    print(result.final_output)
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,38 @@
 import os
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+import sys
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel
 from dotenv import load_dotenv
 from agents.run import RunConfig
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from agent_kit.background import run_sync
+from agent_kit.lazy import LazyModel
 
 # Load environment variables from .env file.
 load_dotenv()
 
-# Fetch Openrouter API key.
-openrouter_api_key = os.getenv('OPENROUTER_API_KEY')
-if not openrouter_api_key:
-    raise ValueError("OPENROUTER_API_KEY not found in .env file!")
-
 # Configure Openrouter via OpenAI compatible API.
-external_client = AsyncOpenAI(
-    api_key=openrouter_api_key,
-    base_url="https://openrouter.ai/api/v1"
-)
+def build_model() -> OpenAIChatCompletionsModel:
+    # Fetch Openrouter API key.
+    openrouter_api_key = os.getenv('OPENROUTER_API_KEY')
+    if not openrouter_api_key:
+        raise ValueError("OPENROUTER_API_KEY not found in .env file!")
 
-# Set up the model.
-model = OpenAIChatCompletionsModel(
-    model="deepseek/deepseek-r1-0528:free",
-    openai_client=external_client
-)
+    external_client = AsyncOpenAI(
+        api_key=openrouter_api_key,
+        base_url="https://openrouter.ai/api/v1"
+    )
+
+    # Set up the model.
+    return OpenAIChatCompletionsModel(
+        model="deepseek/deepseek-r1-0528:free",
+        openai_client=external_client
+    )
+
+model = LazyModel(build_model)
 
 # Disable tracing for simplicity.
 config = RunConfig(
     model=model,
-    model_provider=external_client,
     tracing_disabled=True
 )
 
@@ -36,10 +42,14 @@ agent = Agent(
     model=model
 )
 
-result = Runner.run_sync(
-starting_agent=agent,
-input="Hi! Who are you?",
-run_config=config
-)
-print(result.final_output)
+def main():
+    result = run_sync(
+    starting_agent=agent,
+    input="Hi! Who are you?",
+    run_config=config
+    )
+    print(result.final_output)
+
+if __name__ == "__main__":
+    main()
 